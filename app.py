@@ -1,6 +1,5 @@
 import streamlit as st
 import os
-import subprocess
 import time
 import tempfile
 import shutil
@@ -9,11 +8,38 @@ import re
 import json
 import datetime
 import atexit
+import sys
+import uuid
+from jobs import (Job, JobManager, make_output_key, new_scratch_dir_path, cleanup_all_stale_scratch_dirs,
+                  PRIORITY_LABELS, PRIORITY_NORMAL, PRIORITY_BACKGROUND, STATUS_LABELS, STATUS_DONE, STATUS_FAILED, STATUS_CANCELED, STATUS_QUEUED,
+                  STATUS_RUNNING, STATUS_PAUSED)
+from download_server import ArchiveDownloadServer
+from render_profiles import RENDER_PROFILE_FINAL, RENDER_PROFILE_DRAFT, RENDER_PROFILES, build_render_command
+from clips import clip_tools_available
+from ingest import AnalysisPreparer, load_media_info, get_prepared_timeline_path
+from watch_folders import (FolderWatcher, load_watch_folders, add_watch_folder, remove_watch_folder,
+                           FILE_STABLE_SECONDS)
 
 # Constants for temp directory tracking
 TEMP_DIR_TRACKER_FILE = "temp_dir_tracker.json"
 MAX_TEMP_DIR_AGE_HOURS = 24  # Clean up directories older than this
 
+# 동시에 실행할 auto-editor 작업 수 (나머지는 우선순위 순서로 대기)
+MAX_CONCURRENT_JOBS = 1
+
+# 처리 결과 영역에 표시하는 감시 폴더 작업 수 (실행 중인 작업은 항상 표시, 나머지는 최근 작업만)
+WATCH_FOLDER_JOBS_SHOWN = 5
+# 사용자가 고를 수 있는 작업 우선순위 (백그라운드는 미리 분석 전용)
+USER_PRIORITIES = [priority for priority in PRIORITY_LABELS if priority != PRIORITY_BACKGROUND]
+
+# 개별 클립을 ZIP으로 묶어 바로 내려받는 다운로드 서버 포트
+DOWNLOAD_SERVER_PORT = 8502
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 분석 결과(타임라인)를 저장하는 파일 이름 접미사
+TIMELINE_FILE_SUFFIX = "_timeline.json"
+
 # Function to load the list of tracked temporary directories
 def load_temp_dirs():
     try:
@@ -66,7 +92,7 @@ def is_audio_file(file_path):
     return file_ext in audio_extensions
 
 # Handle file upload and state changes
-def handle_upload():
+def handle_upload(uploaded_file):
     if uploaded_file is not None:
         # 업로드된 파일 저장
         original_file_name = uploaded_file.name
@@ -93,6 +119,8 @@ def handle_upload():
         st.session_state.original_path = temp_path
         st.session_state.temp_path = temp_path
         st.session_state.selected_upload_path = temp_path  # 새로 업로드된 파일을 선택된 파일로 설정
+        # 설정을 고르는 동안 낮은 우선순위로 미디어 정보 확인과 타임라인 분석을 시작 (업로드가 끝난 뒤)
+        sync_analysis_preparation()
         
         # 디버깅 정보
         st.write(f"파일 '{original_file_name}'이 업로드되었습니다.")
@@ -121,6 +149,19 @@ def get_all_tracked_uploads():
             untrack_temp_dir(temp_dir)
     return uploads
 
+# Function to get a version key of the upload catalog (changes whenever the tracker file is rewritten)
+def get_catalog_version():
+    try:
+        tracker_stat = os.stat(TEMP_DIR_TRACKER_FILE)
+        return (tracker_stat.st_mtime_ns, tracker_stat.st_size)
+    except OSError:
+        return None
+
+# 업로드 목록 캐시 - catalog_version이 바뀔 때만 디렉토리 목록을 다시 읽음
+@st.cache_data(show_spinner=False)
+def get_cached_tracked_uploads(catalog_version):
+    return get_all_tracked_uploads()
+
 
 # Function to clean up a temporary directory
 def cleanup_temp_dir(temp_dir):
@@ -223,8 +264,14 @@ def cleanup_on_exit():
     except:
         pass
 
-# Run cleanup of old temp dirs on startup
-startup_cleanup_count = cleanup_old_temp_dirs()
+# Run cleanup of old temp dirs on startup (once per process, then at most once an hour instead of on every rerun)
+@st.cache_resource(ttl=datetime.timedelta(hours=1), show_spinner=False)
+def run_periodic_cleanup():
+    # 기본 출력 폴더뿐 아니라 프로젝트/감시 폴더에 만들어진 작업 임시 폴더도 정리
+    stale_scratch_count = cleanup_all_stale_scratch_dirs(os.path.join(os.getcwd(), "output"), MAX_TEMP_DIR_AGE_HOURS)
+    return cleanup_old_temp_dirs() + stale_scratch_count
+
+startup_cleanup_count = run_periodic_cleanup()
 
 # 세션 종료 시 임시 디렉토리 정리 함수 - 이제 atexit을 통해 관리
 def cleanup_temp_dirs():
@@ -303,26 +350,55 @@ if 'original_file_name' not in st.session_state:
 if 'temp_path' not in st.session_state:
     st.session_state.temp_path = None
 
+if 'job_ids' not in st.session_state:
+    st.session_state.job_ids = []
+
 # 헤더 표시
 st.markdown('<h1 class="main-header">Auto-Editor Web</h1>', unsafe_allow_html=True)
 st.markdown(" ")
 st.markdown("동영상 또는 오디오에서 무음 부분을 자동으로 제거하거나 속도를 조절하세요.")
 
-# output 디렉토리 생성
-output_dir = os.path.join(os.getcwd(), "output")
-os.makedirs(output_dir, exist_ok=True)
+# output 디렉토리 생성 (프로세스당 한 번만 수행)
+@st.cache_resource(show_spinner=False)
+def get_output_dir():
+    output_dir = os.path.join(os.getcwd(), "output")
+    os.makedirs(output_dir, exist_ok=True)
+    return output_dir
 
-# 사이드바 - 설정 옵션
-with st.sidebar:
-    with st.sidebar.expander("최근 파일 업로드 내역", expanded=False):
-        uploads = get_all_tracked_uploads()  # temp_dir_tracker.json 기반 실제 파일 존재 여부 확인
+output_dir = get_output_dir()
+
+# 작업 대기열 (모든 세션이 공유, 프로세스당 하나)
+@st.cache_resource(show_spinner=False)
+def get_job_manager():
+    return JobManager(max_running=MAX_CONCURRENT_JOBS)
+
+# 업로드한 파일의 미리 분석 작업 관리 (작업 대기열에서 낮은 우선순위로 실행, 프로세스당 하나)
+@st.cache_resource(show_spinner=False)
+def get_analysis_preparer():
+    return AnalysisPreparer(get_job_manager())
+
+# 결과 폴더를 임시 압축 파일 없이 ZIP으로 스트리밍하는 다운로드 서버 (프로세스당 하나)
+@st.cache_resource(show_spinner=False)
+def get_download_server():
+    try:
+        return ArchiveDownloadServer(DOWNLOAD_SERVER_PORT)
+    except OSError:
+        # 포트를 사용할 수 없으면 ZIP 다운로드 없이 결과 폴더만 안내
+        return None
+
+# 사이드바 - 최근 파일 업로드 내역 (선택 변경 시 이 영역만 다시 실행)
+@st.fragment
+def render_recent_uploads():
+    with st.expander("최근 파일 업로드 내역", expanded=False):
+        uploads = get_cached_tracked_uploads(get_catalog_version())  # temp_dir_tracker.json 변경 시에만 다시 조회
         if uploads:
             # 파일명만 옵션으로 표시
             options = [name for name, path in uploads]
             
             # 파일을 방금 업로드했다면 해당 파일을 자동 선택
-            if st.session_state.get("selected_upload_path"):
-                selected_filename = os.path.basename(st.session_state.get("selected_upload_path"))
+            previous_path = st.session_state.get("selected_upload_path")
+            if previous_path:
+                selected_filename = os.path.basename(previous_path)
                 if selected_filename in options:
                     default_index = options.index(selected_filename)
                 else:
@@ -346,6 +422,10 @@ with st.sidebar:
                         st.audio(file_path)
                     else:
                         st.video(file_path)
+                    
+                    # 다른 파일을 선택했다면 편집 설정과 원본 파일 영역도 갱신
+                    if previous_path is not None and file_path != previous_path:
+                        st.rerun()
                     break
         else:
             st.info("최근 업로드된 파일이 없습니다.")
@@ -368,6 +448,9 @@ with st.sidebar:
 
         st.markdown(f"※ 디스크 공간 절약을 위하여, {MAX_TEMP_DIR_AGE_HOURS}시간 동안만 유지됩니다.")
 
+# 사이드바 - 편집 설정 (설정 변경 시 이 영역만 다시 실행, 값은 session_state.edit_settings에 저장)
+@st.fragment
+def render_edit_settings():
     st.header("편집 설정")
 
     # 현재 업로드된 파일의 타입에 따라 편집 방식 선택 옵션을 조정
@@ -447,6 +530,16 @@ with st.sidebar:
             index=0
         )
     
+    # MP4 렌더링 품질 (초안으로 컷을 먼저 확인하고, 결과 영역에서 최종 품질로 다시 만들 수 있음)
+    render_profile = RENDER_PROFILE_FINAL
+    if export_format == "MP4 파일":
+        render_profile = st.radio(
+            "렌더링 품질",
+            list(RENDER_PROFILES.keys()),
+            format_func=lambda value: RENDER_PROFILES[value]["label"],
+            help="초안은 절반 해상도와 낮은 비트레이트로 빠르게 렌더링합니다. 확인 후 같은 분석 결과로 최종 품질 렌더링이 가능합니다."
+        )
+    
     # 내보내기 형식에 따라 원본 파일 경로 입력 필드 표시
     if export_format in ["Adobe Premiere Pro", "DaVinci Resolve", "Final Cut Pro", "ShotCut", "개별 클립"]:
         st.markdown("### 🔴 원본 파일 경로 (필수)")
@@ -465,15 +558,413 @@ with st.sidebar:
             )
 
     # 내보내기 형식에 따른 추가 옵션
+    timeline_name = "Auto-Editor Media Group"
     if export_format in ["Adobe Premiere Pro", "DaVinci Resolve", "Final Cut Pro", "ShotCut"]:
         timeline_name = st.text_input("타임라인 이름", "Auto-Editor Media Group", 
                                     help="편집 소프트웨어에서 사용할 타임라인 이름입니다.")
 
-# 메인 영역 - 파일 업로드 및 처리
-upload_col, result_col = st.columns(2)
-final_output_dir = ''
-temp_path = None
-with upload_col:
+    # 작업 우선순위 - 같은 우선순위에서는 짧은(작은) 작업이 먼저 실행됨
+    priority = st.selectbox(
+        "작업 우선순위",
+        USER_PRIORITIES,
+        index=USER_PRIORITIES.index(PRIORITY_NORMAL),
+        format_func=lambda value: PRIORITY_LABELS[value],
+        help="높은 우선순위 작업은 대기 중인 작업보다 먼저 실행되며, 필요하면 낮은 우선순위 작업을 잠시 멈추고 실행됩니다."
+    )
+
+    # 작업 시작 시 원본 파일 영역에서 읽을 수 있도록 저장
+    st.session_state.edit_settings = {
+        "edit_method": edit_method,
+        "threshold_str": threshold_str,
+        "margin": margin,
+        "silent_speed": silent_speed,
+        "video_speed": video_speed,
+        "export_format": export_format,
+        "original_file_path": original_file_path,
+        "timeline_name": timeline_name,
+        "priority": priority,
+        "render_profile": render_profile,
+    }
+    # 분석 설정이 바뀌면 이전 설정으로 시작한 미리 분석을 취소하고 새 설정으로 다시 시작
+    sync_analysis_preparation()
+
+# 사이드바 - 감시 폴더 (녹화 장비가 파일을 저장하는 폴더를 업로드 없이 자동 처리)
+@st.fragment
+def render_watch_folders():
+    with st.expander("감시 폴더 (자동 처리)", expanded=False):
+        watch_folders = load_watch_folders()
+        if watch_folders:
+            for entry in watch_folders:
+                profile = entry["profile"]
+                st.markdown(f"`{entry['path']}`")
+                st.caption(f"{profile['edit_method']} · {profile['threshold_str']} · {profile['export_format']}")
+                if st.button("감시 중지", key=f"unwatch_{entry['path']}"):
+                    remove_watch_folder(entry["path"])
+                    st.rerun(scope="fragment")
+        else:
+            st.info("감시 중인 폴더가 없습니다.")
+
+        folder = st.text_input("감시할 폴더 경로", help="이 폴더에 새로 저장된 파일은 쓰기가 끝나면 자동으로 작업 대기열에 추가됩니다.")
+        if st.button("현재 편집 설정으로 감시 폴더 추가"):
+            if not os.path.isdir(folder):
+                st.error("폴더를 찾을 수 없습니다.")
+            else:
+                # 원본 파일 경로는 감시 폴더의 각 파일 위치를 그대로 사용
+                profile = dict(st.session_state.edit_settings, original_file_path="")
+                add_watch_folder(os.path.abspath(folder), profile)
+                st.rerun(scope="fragment")
+
+        if get_folder_watcher().last_error:
+            st.warning(f"감시 폴더 확인 중 오류: {get_folder_watcher().last_error}")
+        st.markdown(f"※ 파일 크기가 {FILE_STABLE_SECONDS}초 동안 변하지 않으면 저장이 끝난 것으로 보고 처리합니다.")
+
+# Function to point the media references of an exported project file to the user's original file path
+def fix_project_media_paths(actual_output_path, user_path):
+    # 파일이 실제로 생성되었는지 확인
+    if not os.path.exists(actual_output_path):
+        return None
+    try:
+        # XML 파일 읽기
+        with open(actual_output_path, 'r', encoding='utf-8') as file:
+            xml_content = file.read()
+        
+        # 임시 경로가 있다면 사용자 지정 경로로 교체
+        # Windows 경로를 URL 형식으로 변환 (file:/// 형식용)
+        url_path = user_path.replace("\\", "/").replace(":", "%3A")
+        
+        # XML에서 참조하는 file:/// 형식 경로 패턴
+        file_url_pattern = r'src="file:///[^"]*"'
+        file_url_replacement = f'src="file:///{url_path}"'
+        
+        # 일반 경로 패턴
+        path_pattern = r'src=[\'"][^\'"\n]*[\'"]'
+        path_replacement = f'src="{user_path}"'
+        
+        # 다른 형식의 경로 패턴
+        file_path_pattern = r'<file-path>[^<]*</file-path>'
+        file_path_replacement = f'<file-path>{user_path}</file-path>'
+        
+        # 또 다른 경로 패턴
+        attr_path_pattern = r'path="[^"]*"'
+        attr_path_replacement = f'path="{user_path}"'
+        
+        # 각 패턴에 대해 순차적으로 치환
+        modified_content = xml_content
+        modified_content = re.sub(file_url_pattern, file_url_replacement, modified_content)
+        modified_content = re.sub(path_pattern, path_replacement, modified_content)
+        modified_content = re.sub(file_path_pattern, file_path_replacement, modified_content)
+        modified_content = re.sub(attr_path_pattern, attr_path_replacement, modified_content)
+        
+        # 수정된 내용 저장
+        with open(actual_output_path, 'w', encoding='utf-8') as file:
+            file.write(modified_content)
+        
+        return f"프로젝트 파일의 미디어 경로를 '{user_path}'로 업데이트했습니다."
+    except Exception as e:
+        return f"프로젝트 파일 경로 수정 중 오류 발생: {str(e)}"
+
+# Function to build an auto-editor job for a media file from the edit settings (used by the upload panel and watch folders)
+def build_job(temp_path, settings, project_media_path=None):
+    margin = settings["margin"]
+    silent_speed = settings["silent_speed"]
+    video_speed = settings["video_speed"]
+    export_format = settings["export_format"]
+    original_file_path = settings["original_file_path"]
+    timeline_name = settings["timeline_name"]
+    render_profile = settings.get("render_profile", RENDER_PROFILE_FINAL)
+    notes = []
+    
+    # 편집 방식에 따른 명령 옵션 설정
+    edit_option = get_edit_option(settings)
+    
+    # 내보내기 형식에 따른 옵션 설정
+    export_option = ""
+    
+    # 파일명에서 공백과 특수문자 제거하여 안전한 파일명 생성
+    safe_filename = re.sub(r'[^\w\.-]', '_', os.path.splitext(os.path.basename(temp_path))[0])
+    # 출력 파일 이름 (확장자 없이) 및 결과를 게시할 폴더
+    output_name = safe_filename + "_edited"
+    publish_root = output_dir
+    
+    # 내보내기 형식 설정
+    if export_format == "WAV 파일":
+        export_option = "--export default --output-format wav"
+    elif export_format != "MP4 파일":
+        # 프로젝트 파일 내보내기 설정 (원본 파일 경로 필수)
+        if export_format == "Adobe Premiere Pro":
+            export_type = "premiere"
+            project_ext = ".xml"
+        elif export_format == "DaVinci Resolve":
+            export_type = "resolve"
+            project_ext = ".xml"
+        elif export_format == "Final Cut Pro":
+            export_type = "final-cut-pro"
+            project_ext = ".fcpxml"
+        elif export_format == "ShotCut":
+            export_type = "shotcut"
+            project_ext = ".mlt"
+        else:  # 개별 클립
+            export_type = "clip-sequence"
+            project_ext = ""  # 폴더로 내보내짐
+        
+        # 원본 파일명 사용 (업로드된 파일 이름)
+        original_name = os.path.splitext(os.path.basename(temp_path))[0]
+        
+        # 사용자가 입력한 경로가 폴더 경로인지 확인
+        if os.path.isdir(original_file_path):
+            # 폴더 경로면 그대로 사용
+            project_folder = original_file_path
+        else:
+            # 파일 경로라면 디렉토리 부분만 추출
+            project_folder = os.path.dirname(original_file_path)
+        
+        # 프로젝트 파일을 지정된 폴더에 저장 (확장자 없이)
+        # 원본 파일 이름 기반으로 프로젝트 파일명 생성
+        output_name = original_name + "_project"
+        publish_root = project_folder
+        
+        # 타임라인 이름 설정
+        if timeline_name and timeline_name != "Auto-Editor Media Group":
+            export_option = f"--export {export_type}:name=\"{timeline_name}\""
+        else:
+            export_option = f"--export {export_type}"
+        
+        # 원본 미디어 파일 경로
+        # 폴더 안의 업로드된 파일 이름과 동일한 파일을 찾아야 함
+        media_file_path = os.path.join(project_folder, os.path.basename(temp_path))
+        
+        if os.path.exists(media_file_path):
+            # 폴더 안에 동일한 이름의 파일이 있으면 사용
+            temp_path = media_file_path
+            notes.append(f"원본 파일을 찾았습니다: {media_file_path}")
+        else:
+            # 없으면 먼저 임시 파일을 해당 폴더로 복사
+            try:
+                # 폴더가 존재하는지 확인
+                if not os.path.exists(project_folder):
+                    os.makedirs(project_folder)
+                
+                # 임시 파일을 해당 폴더로 복사
+                shutil.copy2(temp_path, media_file_path)
+                temp_path = media_file_path
+                notes.append(f"파일을 다음 위치로 복사했습니다: {media_file_path}")
+            except Exception as e:
+                notes.append(f"파일 복사 중 오류: {str(e)}")
+                notes.append("임시 업로드된 파일을 사용합니다.")
+    
+    # 원본 파일과 설정으로 결과 폴더 이름 결정 (같은 파일, 같은 설정이면 같은 폴더)
+    params = {
+        "edit": edit_option,
+        "margin": margin,
+        "silent_speed": silent_speed,
+        "video_speed": video_speed,
+        "export": export_option,
+    }
+    if export_format == "MP4 파일":
+        params["render_profile"] = render_profile
+    publish_dir = os.path.join(publish_root, f"{output_name}_{make_output_key(temp_path, params)}")
+    
+    # 작업 전용 임시 폴더에 생성한 뒤, 완료되면 결과 폴더로 한 번에 이동
+    scratch_dir = new_scratch_dir_path(publish_root)
+    output_path_without_ext = os.path.join(scratch_dir, output_name)
+    
+    # 명령어 구성
+    cmd = [
+        "auto-editor",
+        temp_path,
+        "--edit", edit_option,
+        "--margin", f"{margin}sec",
+        "--silent-speed", str(silent_speed),
+        "--video-speed", str(video_speed),
+        "--output",  output_path_without_ext
+    ]
+    
+    # 내보내기 옵션 추가 (있는 경우)
+    if export_option:
+        cmd.extend(export_option.split())
+    cmds = [cmd]
+    timeline_file = None
+    depends_on = None
+    
+    # MP4: 먼저 타임라인만 분석해 저장한 뒤 선택한 품질로 렌더링 (초안을 최종 품질로 다시 만들 때 분석을 재사용)
+    if export_format == "MP4 파일":
+        timeline_file = output_name + TIMELINE_FILE_SUFFIX
+        timeline_path = os.path.join(scratch_dir, timeline_file)
+        timeline_step, depends_on = build_timeline_step(temp_path, settings, timeline_path)
+        cmds = [timeline_step]
+        cmds.append(build_render_command(timeline_path, output_path_without_ext + os.path.splitext(temp_path)[1], render_profile))
+    
+    # WAV: MP4와 같이 타임라인을 분석(또는 미리 분석한 결과를 복사)한 뒤 오디오만 렌더링
+    if export_format == "WAV 파일":
+        timeline_file = output_name + TIMELINE_FILE_SUFFIX
+        timeline_path = os.path.join(scratch_dir, timeline_file)
+        timeline_step, depends_on = build_timeline_step(temp_path, settings, timeline_path)
+        cmds = [timeline_step]
+        cmds.append(build_render_command(timeline_path, output_path_without_ext + ".wav", RENDER_PROFILE_FINAL))
+    
+    # 개별 클립: 속도 변경이 없고 ffmpeg/ffprobe 가 설치되어 있으면 auto-editor로 타임라인만 분석한 뒤 클립을 병렬로 추출
+    # (키프레임에서 시작하는 구간은 재인코딩 없이 스트림 복사, 그 외에는 auto-editor clip-sequence 내보내기)
+    if export_format == "개별 클립" and uses_timeline_step(settings):
+        timeline_file = output_name + TIMELINE_FILE_SUFFIX
+        timeline_path = os.path.join(scratch_dir, timeline_file)
+        timeline_step, depends_on = build_timeline_step(temp_path, settings, timeline_path)
+        cmds = [timeline_step]
+        cmds.append([
+            sys.executable, os.path.join(APP_DIR, "clips.py"),
+            timeline_path, temp_path, output_path_without_ext,
+            "--name", output_name
+        ])
+    elif export_format == "개별 클립" and silent_speed == 99999 and video_speed == 1.0:
+        notes.append("ffmpeg/ffprobe 가 설치되어 있지 않아 auto-editor로 클립을 내보냅니다 (설치하면 더 빠르게 처리됩니다).")
+    
+    # 완료 후 XML 파일 경로 수정 (프로젝트 파일인 경우)
+    on_success = None
+    if export_format in ["Adobe Premiere Pro", "DaVinci Resolve", "Final Cut Pro", "ShotCut"] and project_media_path:
+        # 실제 프로젝트 파일 경로 결정 (확장자 포함)
+        actual_output_path = output_path_without_ext + project_ext
+        user_path = project_media_path
+        
+        def on_success(job):
+            message = fix_project_media_paths(actual_output_path, user_path)
+            if message:
+                job.last_log = message
+    
+    # 작업 생성 (대기열에서 우선순위와 파일 크기에 따라 실행 순서가 정해짐)
+    job = Job(
+        name=os.path.basename(temp_path),
+        cmds=cmds,
+        scratch_dir=scratch_dir,
+        publish_dir=publish_dir,
+        source_path=temp_path,
+        params=params,
+        priority=settings["priority"],
+        estimated_cost=os.path.getsize(temp_path),
+        on_success=on_success,
+        archive_download=export_format == "개별 클립",
+        timeline_file=timeline_file,
+        depends_on=depends_on
+    )
+    job.last_log = "\n".join(notes)
+    return job
+
+# Function to get the auto-editor --edit option from the edit settings
+def get_edit_option(settings):
+    if settings["edit_method"] == "오디오 기반 (무음 감지)":
+        return f"audio:threshold={settings['threshold_str']}"
+    return f"motion:threshold={settings['threshold_str']}"
+
+# Function to build the auto-editor command that only analyses the input and writes a v3 timeline
+def build_analysis_command(source_path, settings, timeline_path):
+    return [
+        "auto-editor",
+        source_path,
+        "--edit", get_edit_option(settings),
+        "--margin", f"{settings['margin']}sec",
+        "--silent-speed", str(settings["silent_speed"]),
+        "--video-speed", str(settings["video_speed"]),
+        "--output", timeline_path,
+        "--export", "v3"
+    ]
+
+# 타임라인을 먼저 분석하는 형식인지 (MP4, WAV, ffmpeg 으로 자르는 속도 변경 없는 개별 클립) - 미리 분석은 이 형식에서만 사용
+# (프로젝트 파일은 원본 경로로 복사한 미디어를 분석해야 하므로 제외)
+def uses_timeline_step(settings):
+    if settings["export_format"] in ["MP4 파일", "WAV 파일"]:
+        return True
+    return (settings["export_format"] == "개별 클립" and settings["silent_speed"] == 99999
+            and settings["video_speed"] == 1.0 and clip_tools_available())
+
+# 같은 파일, 같은 분석 설정이면 같은 키 (내보내기 형식/렌더링 품질은 타임라인에 영향 없음)
+def get_analysis_key(source_path, settings):
+    return make_output_key(source_path, {
+        "edit": get_edit_option(settings),
+        "margin": settings["margin"],
+        "silent_speed": settings["silent_speed"],
+        "video_speed": settings["video_speed"],
+    })
+
+# Function to keep one background analysis per session for the uploaded file and the current settings
+# (작업 시작 버튼을 누를 때 타임라인이 이미 있거나 분석 중이면 그 결과를 재사용)
+def sync_analysis_preparation():
+    # 작업 시작 시 사용할 파일 (최근 업로드 내역에서 선택한 파일 또는 방금 업로드한 파일)
+    source_path = st.session_state.get("selected_upload_path") or st.session_state.get("temp_path")
+    settings = st.session_state.get("edit_settings")
+    analysis_key = None
+    if source_path and settings and os.path.exists(source_path) and uses_timeline_step(settings):
+        analysis_key = get_analysis_key(source_path, settings)
+    
+    # 파일이나 분석 설정이 바뀐 경우에만 다시 예약 (설정이 잠시 그대로 유지되면 분석 시작)
+    if analysis_key == st.session_state.get("prepared_analysis_key"):
+        return
+    if "analysis_owner" not in st.session_state:
+        st.session_state.analysis_owner = uuid.uuid4().hex
+    get_analysis_preparer().schedule(
+        st.session_state.analysis_owner,
+        analysis_key,
+        source_path,
+        lambda timeline_path: build_analysis_command(source_path, settings, timeline_path)
+    )
+    st.session_state.prepared_analysis_key = analysis_key
+
+# Function to build the job step that produces the timeline and the job it has to wait for
+# (미리 분석한 타임라인이 있으면 복사, 분석 중이면 끝난 뒤 복사하고, 미리 분석이 실패/취소된 경우에만 직접 분석)
+def build_timeline_step(source_path, settings, timeline_path):
+    analysis_cmd = build_analysis_command(source_path, settings, timeline_path)
+    analysis_key = get_analysis_key(source_path, settings)
+    prepared_timeline_path = get_prepared_timeline_path(source_path, analysis_key)
+    # 설정을 바꾼 직후라 아직 예약만 된 미리 분석은 바로 시작하여 그 결과를 기다림
+    preparer = get_analysis_preparer()
+    preparer.start_now(analysis_key)
+    prepared_job = preparer.get_active_job(analysis_key)
+    if prepared_job is None and not os.path.exists(prepared_timeline_path):
+        return analysis_cmd, None
+    copy_cmd = [sys.executable, os.path.join(APP_DIR, "ingest.py"), "copy", prepared_timeline_path, timeline_path, "--"] + analysis_cmd
+    return copy_cmd, prepared_job.id if prepared_job is not None else None
+
+# Function to re-render a finished draft job at final quality from its published timeline (no re-analysis)
+def build_promoted_job(draft_job):
+    timeline_path = os.path.join(draft_job.publish_dir, draft_job.timeline_file)
+    output_name = draft_job.timeline_file[:-len(TIMELINE_FILE_SUFFIX)]
+    params = dict(draft_job.params, render_profile=RENDER_PROFILE_FINAL)
+    publish_root = os.path.dirname(draft_job.publish_dir)
+    # 처음부터 최종 품질로 처리한 작업과 같은 결과 폴더가 되도록 원본 파일과 설정으로 이름 결정
+    publish_dir = os.path.join(publish_root, f"{output_name}_{make_output_key(draft_job.source_path, params)}")
+    scratch_dir = new_scratch_dir_path(publish_root)
+    output_path = os.path.join(scratch_dir, output_name + os.path.splitext(draft_job.name)[1])
+    
+    return Job(
+        name=draft_job.name,
+        cmds=[build_render_command(timeline_path, output_path, RENDER_PROFILE_FINAL)],
+        scratch_dir=scratch_dir,
+        publish_dir=publish_dir,
+        source_path=draft_job.source_path,
+        params=params,
+        priority=draft_job.priority,
+        estimated_cost=draft_job.estimated_cost
+    )
+
+# 감시 폴더 확인 스레드 (프로세스당 하나) - 쓰기가 끝난 파일을 복사 없이 원래 위치에서 작업 대기열에 등록
+@st.cache_resource(show_spinner=False)
+def get_folder_watcher():
+    job_manager = get_job_manager()
+    
+    def submit_watch_folder_file(file_path, profile):
+        settings = dict(profile, original_file_path=file_path)
+        return job_manager.submit(build_job(file_path, settings))
+    
+    return FolderWatcher(submit_watch_folder_file)
+
+get_folder_watcher()
+
+# 사이드바 - 설정 옵션
+with st.sidebar:
+    render_recent_uploads()
+    render_edit_settings()
+    render_watch_folders()
+
+# 메인 영역 - 원본 파일 업로드 및 처리 (업로드/미리보기는 이 영역만 다시 실행)
+@st.fragment
+def render_upload_panel():
     st.markdown('<p class="sub-header">원본 파일</p>', unsafe_allow_html=True)
     
     # 비디오 및 오디오 파일 업로더
@@ -483,7 +974,7 @@ with upload_col:
     # 파일 업로드 처리
     if uploaded_file is not None and (st.session_state.original_file_name != uploaded_file.name):
         # 파일 이름이 변경되었으면 처리
-        if handle_upload():
+        if handle_upload(uploaded_file):
             st.rerun()
     
     # 기존 업로드된 파일이 있는지 확인
@@ -516,7 +1007,7 @@ with upload_col:
                     st.video(temp_path)
             else:
                 # 만약 아직 처리되지 않았으면 처리
-                if handle_upload():
+                if handle_upload(uploaded_file):
                     st.rerun()
     
     if temp_path and os.path.exists(temp_path):
@@ -524,264 +1015,157 @@ with upload_col:
         file_size_mb = os.path.getsize(temp_path) / (1024 * 1024)
         file_name = os.path.basename(temp_path)
         file_type = "오디오" if st.session_state.is_audio_file else "비디오"
-        st.info(f"파일 이름: {file_name}\n\n파일 크기: {file_size_mb:.2f} MB\n\n파일 타입: {file_type}")
+        file_info = f"파일 이름: {file_name}\n\n파일 크기: {file_size_mb:.2f} MB\n\n파일 타입: {file_type}"
+        
+        # 업로드 직후 미리 확인한 미디어 정보가 있으면 재생 시간 표시
+        media_info = load_media_info(temp_path)
+        if media_info and media_info.get("format", {}).get("duration"):
+            duration_seconds = int(float(media_info["format"]["duration"]))
+            file_info += f"\n\n재생 시간: {duration_seconds // 60}분 {duration_seconds % 60}초"
+        st.info(file_info)
 
     if st.session_state.get("original_path") and os.path.exists(st.session_state.get("original_path")):
         process_button = st.button("작업 시작")
     
         if process_button:
+            # 사이드바 편집 설정 읽기
+            settings = st.session_state.edit_settings
+            export_format = settings["export_format"]
+            
             # 프로젝트 내보내기 시 원본 경로가 필요
-            if export_format in ["Adobe Premiere Pro", "DaVinci Resolve", "Final Cut Pro", "ShotCut", "개별 클립"] and not original_file_path:
+            if export_format in ["Adobe Premiere Pro", "DaVinci Resolve", "Final Cut Pro", "ShotCut", "개별 클립"] and not settings["original_file_path"]:
                 st.error("🔴 프로젝트 파일 내보내기를 위해서는 원본 파일 경로를 입력해야 합니다.")
             else:
-                # 편집 방식에 따른 명령 옵션 설정
-                if edit_method == "오디오 기반 (무음 감지)":
-                    edit_option = f"audio:threshold={threshold_str}"
-                else:
-                    edit_option = f"motion:threshold={threshold_str}"
-                
-                # 내보내기 형식에 따른 옵션 설정
-                export_option = ""
-                
-                # 파일명에서 공백과 특수문자 제거하여 안전한 파일명 생성
-                safe_filename = re.sub(r'[^\w\.-]', '_', os.path.splitext(os.path.basename(temp_path))[0])
-                # 출력 파일 경로 (확장자 없이)
-                output_path_without_ext = os.path.join(output_dir, safe_filename + "_edited")
-                
-                # 내보내기 형식 설정
                 if export_format == "MP4 파일":
                     st.session_state.output_file_type = "video"
                 elif export_format == "WAV 파일":
-                    export_option = "--export default --output-format wav"
                     st.session_state.output_file_type = "audio"
                 else:
-                    # 프로젝트 파일 내보내기 설정 (원본 파일 경로 필수)
-                    if export_format == "Adobe Premiere Pro":
-                        export_type = "premiere"
-                        project_ext = ".xml"
-                    elif export_format == "DaVinci Resolve":
-                        export_type = "resolve"
-                        project_ext = ".xml"
-                    elif export_format == "Final Cut Pro":
-                        export_type = "final-cut-pro"
-                        project_ext = ".fcpxml"
-                    elif export_format == "ShotCut":
-                        export_type = "shotcut"
-                        project_ext = ".mlt"
-                    else:  # 개별 클립
-                        export_type = "clip-sequence"
-                        project_ext = ""  # 폴더로 내보내짐
-                    
-                    # 원본 파일명 사용 (업로드된 파일 이름)
-                    original_name = os.path.splitext(os.path.basename(temp_path))[0]
-                    
-                    # 사용자가 입력한 경로가 폴더 경로인지 확인
-                    if os.path.isdir(original_file_path):
-                        # 폴더 경로면 그대로 사용
-                        project_folder = original_file_path
-                    else:
-                        # 파일 경로라면 디렉토리 부분만 추출
-                        project_folder = os.path.dirname(original_file_path)
-                    
-                    # 프로젝트 파일을 지정된 폴더에 저장 (확장자 없이)
-                    # 원본 파일 이름 기반으로 프로젝트 파일명 생성
-                    output_path_without_ext = os.path.join(project_folder, original_name + "_project")
-                    
-                    # 타임라인 이름 설정
-                    if timeline_name and timeline_name != "Auto-Editor Media Group":
-                        export_option = f"--export {export_type}:name=\"{timeline_name}\""
-                    else:
-                        export_option = f"--export {export_type}"
-                    
                     st.session_state.output_file_type = "project"
-                    
-                    # 원본 미디어 파일 경로
-                    # 폴더 안의 업로드된 파일 이름과 동일한 파일을 찾아야 함
-                    media_file_path = os.path.join(project_folder, os.path.basename(temp_path))
-                    
-                    if os.path.exists(media_file_path):
-                        # 폴더 안에 동일한 이름의 파일이 있으면 사용
-                        temp_path = media_file_path
-                        st.info(f"원본 파일을 찾았습니다: {media_file_path}")
+                
+                # 작업 대기열에 등록
+                job = build_job(temp_path, settings, st.session_state.get("original_file_path"))
+                st.session_state.job_ids.append(get_job_manager().submit(job))
+                
+                # 처리 결과 영역에서 진행 상황을 표시하도록 갱신
+                st.rerun()
+
+# 메인 영역 - 처리 결과 (작업 진행 중에는 1초마다 이 영역만 갱신)
+def render_result_panel():
+    st.markdown('<p class="sub-header">처리 결과</p>', unsafe_allow_html=True)
+    
+    job_manager = get_job_manager()
+    # 이 세션에서 시작한 작업과 감시 폴더 작업을 최신 순으로 표시
+    watch_job_ids = list(get_folder_watcher().job_ids)
+    session_jobs = [job_manager.get(job_id) for job_id in st.session_state.job_ids]
+    watch_jobs = sorted((job for job in map(job_manager.get, watch_job_ids) if job is not None),
+                        key=lambda job: job.seq, reverse=True)
+    # 감시 폴더 작업은 실행 중인 작업과 최근 작업 몇 개만 표시 (파일이 많아도 1초마다 전부 다시 그리지 않도록)
+    running_watch_jobs = [job for job in watch_jobs if job.status in (STATUS_RUNNING, STATUS_PAUSED)]
+    other_watch_jobs = [job for job in watch_jobs if job not in running_watch_jobs]
+    shown_watch_jobs = running_watch_jobs + other_watch_jobs[:WATCH_FOLDER_JOBS_SHOWN]
+    jobs = sorted((job for job in session_jobs + shown_watch_jobs if job is not None),
+                  key=lambda job: job.seq, reverse=True)
+    
+    if not jobs:
+        st.info("파일을 업로드하고 처리를 시작하면 여기에 결과가 표시됩니다.")
+        return
+    
+    hidden_watch_jobs = other_watch_jobs[WATCH_FOLDER_JOBS_SHOWN:]
+    if hidden_watch_jobs:
+        hidden_queued_count = sum(job.status == STATUS_QUEUED for job in hidden_watch_jobs)
+        st.caption(f"감시 폴더 작업 {len(hidden_watch_jobs)}건은 표시하지 않았습니다 (대기 중 {hidden_queued_count}건).")
+    
+    for job in jobs:
+        with st.container(border=True):
+            origin = " · 감시 폴더" if job.id in watch_job_ids else ""
+            st.markdown(f"**{job.name}** · {STATUS_LABELS[job.status]} · 우선순위: {PRIORITY_LABELS[job.priority]}{origin}")
+            
+            if job.is_active:
+                if job.status == STATUS_QUEUED:
+                    dependency = job_manager.get(job.depends_on)
+                    if dependency is not None and dependency.is_active:
+                        st.caption("업로드 후 시작한 미리 분석이 끝나면 이어서 처리합니다.")
                     else:
-                        # 없으면 먼저 임시 파일을 해당 폴더로 복사
-                        try:
-                            # 폴더가 존재하는지 확인
-                            if not os.path.exists(project_folder):
-                                os.makedirs(project_folder)
-                            
-                            # 임시 파일을 해당 폴더로 복사
-                            shutil.copy2(temp_path, media_file_path)
-                            temp_path = media_file_path
-                            st.info(f"파일을 다음 위치로 복사했습니다: {media_file_path}")
-                        except Exception as e:
-                            st.warning(f"파일 복사 중 오류: {str(e)}")
-                            st.warning("임시 업로드된 파일을 사용합니다.")
+                        st.caption(f"대기 순서: {job_manager.queue_position(job.id)}번째")
+                st.progress(job.progress / 100, text=f"처리 중... {job.progress}%")
+                if job.last_log:
+                    st.code(job.last_log)
+                if st.button("작업 취소", key=f"cancel_{job.id}", help="실행 중인 프로세스를 종료하고 생성 중이던 결과 파일을 삭제합니다."):
+                    job_manager.cancel(job.id)
+                    st.rerun(scope="fragment")
+            elif job.status == STATUS_DONE:
+                st.session_state.processed = True
+                render_profile = job.params.get("render_profile")
+                profile_label = f" · {RENDER_PROFILES[render_profile]['label']}" if render_profile else ""
+                if job.reused:
+                    st.caption(f"같은 설정으로 처리된 결과 재사용{profile_label}")
+                else:
+                    st.caption(f"처리 시간: {job.elapsed_seconds:.1f}초{profile_label}")
+                st.markdown(f"""
+                <div class="success-box">
+                    <h3>처리 완료!</h3>
+                    <p>결과 파일은 다음 위치에 저장되었습니다:</p>
+                    <p><code>{job.publish_dir}</code></p>
+                </div>
+                """, unsafe_allow_html=True)
                 
-                # 명령어 구성
-                cmd = [
-                    "auto-editor",
-                    temp_path,
-                    "--edit", edit_option,
-                    "--margin", f"{margin}sec",
-                    "--silent-speed", str(silent_speed),
-                    "--video-speed", str(video_speed),
-                    "--output",  output_path_without_ext
-                ]
+                # 프로젝트 파일 경로 정보 표시 (있는 경우)
+                if 'original_file_path' in st.session_state:
+                    st.markdown(f"""
+                    <div class="info-box">
+                        <h4>프로젝트 파일 정보</h4>
+                        <p>프로젝트 파일은 다음 경로의 미디어를 참조합니다:</p>
+                        <p><code>{st.session_state.original_file_path}</code></p>
+                        <p>편집 프로그램에서 프로젝트 파일을 열 때 이 경로에 미디어 파일이 있어야 합니다.</p>
+                    </div>
+                    """, unsafe_allow_html=True)
                 
-                # 내보내기 옵션 추가 (있는 경우)
-                if export_option:
-                    cmd.extend(export_option.split())
+                # 초안을 같은 타임라인으로 최종 품질 렌더링 (분석 단계 생략)
+                if render_profile == RENDER_PROFILE_DRAFT and job.timeline_file:
+                    # 타임라인은 원본 파일을 참조하므로 원본이 정리된 경우 다시 만들 수 없음
+                    source_exists = os.path.exists(job.source_path)
+                    if st.button("최종 품질로 다시 만들기", key=f"promote_{job.id}", disabled=not source_exists,
+                                 help=None if source_exists else "원본 파일이 삭제되어 다시 만들 수 없습니다."):
+                        st.session_state.job_ids.append(job_manager.submit(build_promoted_job(job)))
+                        st.rerun()
                 
-                # 명령 실행 시작
-                with st.spinner("작업 중..."):
-                    # 명령어 표시 (디버깅용)
-                    st.code(" ".join(cmd))
-                    
-                    # 프로그레스 바
-                    progress_bar = st.progress(0)
-                    progress_text = st.empty()
-                    
-                    # 명령 실행 및 진행상황 업데이트
-                    log_line = st.empty()
-                    
-                    process = subprocess.Popen(
-                        cmd,
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.STDOUT,
-                        universal_newlines=True,
-                        bufsize=1
-                    )
-                    
-                    # 진행 상황 추적 및 업데이트
-                    progress_percentage = 0
-                    for line in process.stdout:
-                        # 최신 로그 1줄만 표시 
-                        log_line.code(line.strip())
-                        
-                        # 진행 상황 표시
-                        if "%" in line and "Progress:" in line:
-                            try:
-                                percentage_match = re.search(r'(\d+)%', line)
-                                if percentage_match:
-                                    progress_percentage = int(percentage_match.group(1))
-                                    progress_bar.progress(progress_percentage / 100)
-                                    progress_text.text(f"처리 중... {progress_percentage}%")
-                            except Exception:
-                                pass
-                    
-                    # 프로세스 완료 대기
-                    process.wait()
-                    
-                    # 완료 표시
-                    progress_bar.progress(100)
-                    progress_text.text("처리 완료!")
-                    
-                    # XML 파일 경로 수정 (프로젝트 파일인 경우)
-                    if export_format in ["Adobe Premiere Pro", "DaVinci Resolve", "Final Cut Pro", "ShotCut"] and 'original_file_path' in st.session_state:
-                        # 실제 프로젝트 파일 경로 결정 (확장자 포함)
-                        if export_format == "Adobe Premiere Pro" or export_format == "DaVinci Resolve":
-                            actual_output_path = output_path_without_ext + ".xml"
-                        elif export_format == "Final Cut Pro":
-                            actual_output_path = output_path_without_ext + ".fcpxml"
-                        elif export_format == "ShotCut":
-                            actual_output_path = output_path_without_ext + ".mlt"
-                        else:
-                            actual_output_path = output_path_without_ext  # 폴더일 수 있음
-                        
-                        # 파일이 실제로 생성되었는지 확인
-                        if os.path.exists(actual_output_path):
-                            try:
-                                # XML 파일 읽기
-                                with open(actual_output_path, 'r', encoding='utf-8') as file:
-                                    xml_content = file.read()
-                                
-                                # 임시 경로가 있다면 사용자 지정 경로로 교체
-                                # 사용자가 입력한 경로 가져오기
-                                user_path = st.session_state.original_file_path
-                                
-                                # Windows 경로를 URL 형식으로 변환 (file:/// 형식용)
-                                url_path = user_path.replace("\\", "/").replace(":", "%3A")
-                                
-                                # XML에서 참조하는 file:/// 형식 경로 패턴
-                                file_url_pattern = r'src="file:///[^"]*"'
-                                file_url_replacement = f'src="file:///{url_path}"'
-                                
-                                # 일반 경로 패턴
-                                path_pattern = r'src=[\'"][^\'"\n]*[\'"]'
-                                path_replacement = f'src="{user_path}"'
-                                
-                                # 다른 형식의 경로 패턴
-                                file_path_pattern = r'<file-path>[^<]*</file-path>'
-                                file_path_replacement = f'<file-path>{user_path}</file-path>'
-                                
-                                # 또 다른 경로 패턴
-                                attr_path_pattern = r'path="[^"]*"'
-                                attr_path_replacement = f'path="{user_path}"'
-                                
-                                # 각 패턴에 대해 순차적으로 치환
-                                modified_content = xml_content
-                                modified_content = re.sub(file_url_pattern, file_url_replacement, modified_content)
-                                modified_content = re.sub(path_pattern, path_replacement, modified_content)
-                                modified_content = re.sub(file_path_pattern, file_path_replacement, modified_content)
-                                modified_content = re.sub(attr_path_pattern, attr_path_replacement, modified_content)
-                                
-                                # 수정된 내용 저장
-                                with open(actual_output_path, 'w', encoding='utf-8') as file:
-                                    file.write(modified_content)
-                                    
-                                log_line.text(f"프로젝트 파일의 미디어 경로를 '{user_path}'로 업데이트했습니다.")
-                            except Exception as e:
-                                log_line.text(f"프로젝트 파일 경로 수정 중 오류 발생: {str(e)}")
-                    
-                    # 처리 완료 메시지만 표시
-                    st.success("""
-                    처리가 완료되었습니다!
-                    
-                    output 폴더 또는 원본 파일 경로(입력한 경우)에서 결과 파일을 확인하세요.
-                    """)
-                    
-                    # 경로 표시
-                    if export_format in ["Adobe Premiere Pro", "DaVinci Resolve", "Final Cut Pro", "ShotCut", "개별 클립"] and 'project_folder' in locals():
-                        final_output_dir = project_folder
-                    else:
-                        final_output_dir = output_dir
+                # 개별 클립은 ZIP 파일 하나로 내려받기 (압축 파일을 미리 만들지 않고 전송하면서 생성)
+                if job.archive_download and get_download_server() is not None:
+                    host = st.context.headers.get("Host", "localhost").rsplit(":", 1)[0]
+                    archive_path = get_download_server().register(job.publish_dir)
+                    st.link_button("클립 전체 다운로드 (ZIP)", f"http://{host}:{DOWNLOAD_SERVER_PORT}{archive_path}")
+                
+                # 출력 폴더 열기 버튼 (Windows에서만 작동)
+                if os.name == 'nt':  # Windows
+                    if st.button("결과물 폴더 열기", key=f"open_{job.id}"):
+                        os.startfile(job.publish_dir)
+            elif job.status == STATUS_FAILED:
+                st.error(f"처리 중 오류가 발생했습니다.\n\n{job.last_log}")
+            elif job.status == STATUS_CANCELED:
+                st.warning(job.last_log)
+            
+            with st.expander("실행 명령어"):
+                # 명령어 표시 (디버깅용)
+                st.code("\n".join(" ".join(cmd) for cmd in job.cmds))
+    
+    # 모든 작업이 끝나면 전체 화면을 갱신하여 주기적인 갱신을 중단
+    if st.session_state.get("jobs_polling") and not any(job.is_active for job in jobs):
+        st.rerun()
 
-                    st.code(f"결과물 폴더 위치: {final_output_dir}")
-                    
-                    # 세션 상태는 처리 완료만 표시
-                    st.session_state.processed = True
+# 메인 영역 - 파일 업로드 및 처리
+upload_col, result_col = st.columns(2)
+with upload_col:
+    render_upload_panel()
 
-# 결과 표시 부분을 수정합니다
 with result_col:
-    st.markdown('<p class="sub-header">처리 결과</p>', unsafe_allow_html=True)
-    
-    if st.session_state.processed:                
-        st.markdown(f"""
-        <div class="success-box">
-            <h3>처리 완료!</h3>
-            <p>결과 파일은 다음 위치에 저장되었습니다:</p>
-            <p><code>{final_output_dir}</code></p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # 프로젝트 파일 경로 정보 표시 (있는 경우)
-        if 'original_file_path' in st.session_state:
-            st.markdown(f"""
-            <div class="info-box">
-                <h4>프로젝트 파일 정보</h4>
-                <p>프로젝트 파일은 다음 경로의 미디어를 참조합니다:</p>
-                <p><code>{st.session_state.original_file_path}</code></p>
-                <p>편집 프로그램에서 프로젝트 파일을 열 때 이 경로에 미디어 파일이 있어야 합니다.</p>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        # 출력 폴더 열기 버튼 (Windows에서만 작동)
-        if os.name == 'nt':  # Windows
-            if st.button("결과물 폴더 열기"):
-                os.startfile(final_output_dir)
-    else:
-        st.info("파일을 업로드하고 처리를 시작하면 여기에 결과가 표시됩니다.")
+    # 진행 중인 작업이 있을 때만 주기적으로 갱신
+    job_manager = get_job_manager()
+    st.session_state.jobs_polling = any(
+        job_manager.get(job_id) is not None and job_manager.get(job_id).is_active
+        for job_id in st.session_state.job_ids + get_folder_watcher().job_ids
+    )
+    st.fragment(render_result_panel, run_every=1 if st.session_state.jobs_polling else None)()
 
 # 임시 파일 정리 등 시스템 알림 영역 추가
 with st.sidebar:
@@ -0,0 +1,85 @@
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+from ingest import probe_media
+from render_profiles import RENDER_PROFILE_FINAL, RENDER_PROFILES, build_render_command
+
+
+# Function to run a command and return how long it took in seconds (raises if the command fails)
+def timed_run(cmd):
+    started = time.perf_counter()
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, universal_newlines=True)
+    elapsed = time.perf_counter() - started
+    if result.returncode != 0:
+        raise RuntimeError(f"명령어 실행 실패: {' '.join(cmd)}\n{result.stderr.strip()}")
+    return elapsed
+
+def get_duration_seconds(source_path):
+    media_info = probe_media(source_path)
+    try:
+        return float(media_info["format"]["duration"])
+    except (TypeError, KeyError, ValueError):
+        return None
+
+# Function to analyse a file once and render the same timeline with every render profile
+def benchmark_render_profiles(source_path, edit_option, repeat, work_dir):
+    timeline_path = os.path.join(work_dir, "timeline.json")
+    analysis_seconds = timed_run(["auto-editor", source_path, "--edit", edit_option,
+                                  "--output", timeline_path, "--export", "v3"])
+
+    file_ext = os.path.splitext(source_path)[1]
+    results = {}
+    for render_profile in RENDER_PROFILES:
+        output_path = os.path.join(work_dir, render_profile + file_ext)
+        durations = []
+        for _ in range(repeat):
+            if os.path.exists(output_path):
+                os.remove(output_path)
+            durations.append(timed_run(build_render_command(timeline_path, output_path, render_profile)))
+        results[render_profile] = {
+            "seconds": statistics.median(durations),
+            "size": os.path.getsize(output_path) if os.path.exists(output_path) else None,
+        }
+    return analysis_seconds, results
+
+def print_report(source_path, analysis_seconds, results):
+    duration = get_duration_seconds(source_path)
+    final_seconds = results[RENDER_PROFILE_FINAL]["seconds"]
+
+    print(f"입력 파일: {source_path}" + (f" ({duration:.1f}초)" if duration else ""))
+    print(f"분석 (타임라인 생성): {analysis_seconds:.2f}초")
+    for render_profile, result in results.items():
+        seconds = result["seconds"]
+        details = [f"렌더링 {seconds:.2f}초"]
+        if duration:
+            details.append(f"실시간 대비 {duration / seconds:.1f}배")
+        details.append(f"최종 대비 {final_seconds / seconds:.1f}배 빠름")
+        if result["size"] is not None:
+            details.append(f"{result['size'] / (1024 * 1024):.1f} MB")
+        print(f"{RENDER_PROFILES[render_profile]['label']}: " + " · ".join(details))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="같은 타임라인을 렌더링 프로필별로 렌더링하여 속도 비교")
+    parser.add_argument("source")
+    parser.add_argument("--edit", default="audio:threshold=0.04", help="auto-editor --edit 옵션")
+    parser.add_argument("--repeat", type=int, default=3, help="프로필마다 반복 횟수 (중앙값으로 보고)")
+    args = parser.parse_args()
+    if not os.path.isfile(args.source):
+        parser.error(f"파일을 찾을 수 없습니다: {args.source}")
+
+    work_dir = tempfile.mkdtemp(prefix="bench_render_")
+    try:
+        analysis_seconds, results = benchmark_render_profiles(args.source, args.edit, max(1, args.repeat), work_dir)
+    except RuntimeError as e:
+        print(str(e), file=sys.stderr)
+        sys.exit(1)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    print_report(args.source, analysis_seconds, results)
@@ -0,0 +1,126 @@
+import os
+import sys
+import json
+import shutil
+import argparse
+import subprocess
+from fractions import Fraction
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# 잘라낼 지점과 키프레임의 차이가 이 값(초) 이내면 재인코딩 없이 스트림 복사
+KEYFRAME_TOLERANCE_SECONDS = 0.05
+
+# 재인코딩 시 컨테이너별 코덱 (그 외 형식은 H.264/AAC)
+REENCODE_CODECS = {
+    ".webm": ["-c:v", "libvpx-vp9", "-c:a", "libopus"],
+}
+DEFAULT_REENCODE_CODECS = ["-c:v", "libx264", "-preset", "veryfast", "-crf", "18", "-c:a", "aac"]
+
+
+# Function to check that the ffmpeg/ffprobe programs this module runs are installed
+# (auto-editor 은 PyAV로 동작하므로 따로 설치하지 않으면 없을 수 있음)
+def clip_tools_available():
+    return shutil.which("ffmpeg") is not None and shutil.which("ffprobe") is not None
+
+# Function to read the kept segments (source start/end in seconds) from an auto-editor v3 timeline
+def load_segments(timeline_path):
+    with open(timeline_path, 'r', encoding='utf-8') as f:
+        timeline = json.load(f)
+
+    timebase = Fraction(timeline["timebase"])
+    tracks = timeline.get("v") or timeline.get("a") or []
+    if not tracks:
+        return []
+
+    segments = []
+    for clip in tracks[0]:
+        speed = clip.get("speed", 1)
+        start = clip["offset"] / timebase
+        end = (clip["offset"] + clip["dur"] * speed) / timebase
+        segments.append((float(start), float(end)))
+    return sorted(segments)
+
+# Function to list the keyframe times of the first video stream (packet scan, no decoding)
+def probe_keyframes(source_path):
+    result = subprocess.run(
+        ["ffprobe", "-v", "error", "-select_streams", "v:0",
+         "-show_entries", "packet=pts_time,flags", "-of", "csv=p=0", source_path],
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, universal_newlines=True
+    )
+    keyframes = []
+    for line in result.stdout.splitlines():
+        pts_time, _, flags = line.partition(",")
+        if "K" in flags:
+            try:
+                keyframes.append(float(pts_time))
+            except ValueError:
+                pass
+    return sorted(keyframes)
+
+# ffmpeg은 스트림 복사 시 시작 지점 직전 키프레임부터 자르므로, 키프레임이 시작 지점 바로 앞에 있어야 함
+def starts_on_keyframe(start, keyframes):
+    return any(0 <= start - keyframe <= KEYFRAME_TOLERANCE_SECONDS for keyframe in keyframes)
+
+# Function to build the ffmpeg command for one clip (stream copy when the cut starts on a keyframe)
+def build_clip_command(source_path, start, end, output_path, stream_copy, threads):
+    cmd = [
+        "ffmpeg", "-y", "-v", "error",
+        "-ss", f"{start:.6f}",
+        "-i", source_path,
+        "-t", f"{end - start:.6f}",
+        "-map", "0:v?", "-map", "0:a?",
+    ]
+    if stream_copy:
+        cmd.extend(["-c", "copy", "-avoid_negative_ts", "make_zero"])
+    else:
+        file_ext = os.path.splitext(output_path)[1].lower()
+        cmd.extend(REENCODE_CODECS.get(file_ext, DEFAULT_REENCODE_CODECS))
+        cmd.extend(["-threads", str(threads)])
+    cmd.append(output_path)
+    return cmd
+
+# Function to export every kept segment as its own file, several ffmpeg processes at a time
+def export_clips(timeline_path, source_path, output_dir, name, workers=None):
+    segments = load_segments(timeline_path)
+    keyframes = probe_keyframes(source_path)
+    os.makedirs(output_dir, exist_ok=True)
+
+    file_ext = os.path.splitext(source_path)[1]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(segments) or 1))
+    # 병렬 작업 수만큼 CPU를 나눠서 재인코딩
+    threads = max(1, (os.cpu_count() or 1) // workers)
+
+    commands = []
+    copied_count = 0
+    for index, (start, end) in enumerate(segments, start=1):
+        stream_copy = starts_on_keyframe(start, keyframes)
+        copied_count += stream_copy
+        output_path = os.path.join(output_dir, f"{name}-{index:04d}{file_ext}")
+        commands.append(build_clip_command(source_path, start, end, output_path, stream_copy, threads))
+
+    print(f"{len(commands)}개 클립 추출 (스트림 복사 {copied_count}개, 재인코딩 {len(commands) - copied_count}개, 동시 작업 {workers}개)", flush=True)
+
+    failed_count = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(subprocess.run, cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+                   for cmd in commands]
+        for done_count, future in enumerate(as_completed(futures), start=1):
+            if future.result().returncode != 0:
+                failed_count += 1
+            print(f"Progress: {done_count * 100 // len(futures)}%", flush=True)
+
+    if failed_count:
+        print(f"{failed_count}개 클립 추출에 실패했습니다.", flush=True)
+    return failed_count == 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="auto-editor v3 타임라인의 구간을 개별 클립 파일로 병렬 추출")
+    parser.add_argument("timeline")
+    parser.add_argument("source")
+    parser.add_argument("output_dir")
+    parser.add_argument("--name", default="clip")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    sys.exit(0 if export_clips(args.timeline, args.source, args.output_dir, args.name, args.workers) else 1)
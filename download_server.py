@@ -0,0 +1,82 @@
+import os
+import json
+import secrets
+import zipfile
+import threading
+from urllib.parse import quote
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from jobs import MANIFEST_FILE_NAME
+
+# 파일을 읽어 압축 파일에 쓰는 단위 (메모리 사용량 상한)
+COPY_CHUNK_SIZE = 1024 * 1024
+
+
+# Function to list the files of a published result directory (from its manifest, in a stable order)
+def list_published_files(publish_dir):
+    with open(os.path.join(publish_dir, MANIFEST_FILE_NAME), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    # 분석 타임라인은 다시 렌더링할 때만 쓰는 중간 결과이므로 내려받는 압축 파일에서 제외
+    timeline_file = manifest.get("timeline")
+    return [artifact["path"] for artifact in manifest["artifacts"] if artifact["path"] != timeline_file]
+
+# Function to write a zip archive of a published directory straight into an unseekable stream
+def stream_zip(publish_dir, stream):
+    # 영상은 이미 압축되어 있으므로 저장 방식(ZIP_STORED)으로 빠르게 묶음
+    with zipfile.ZipFile(stream, "w", compression=zipfile.ZIP_STORED, allowZip64=True) as archive:
+        for relative_path in list_published_files(publish_dir):
+            file_path = os.path.join(publish_dir, *relative_path.split("/"))
+            zip_info = zipfile.ZipInfo.from_file(file_path, relative_path)
+            with open(file_path, "rb") as src, archive.open(zip_info, "w", force_zip64=True) as dest:
+                while True:
+                    chunk = src.read(COPY_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    dest.write(chunk)
+
+
+class ArchiveDownloadServer:
+    def __init__(self, port):
+        self.port = port
+        self.archives = {}  # token -> 게시된 결과 폴더
+        self.lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                token = self.path.strip("/").split("/")[0]
+                with server.lock:
+                    publish_dir = server.archives.get(token)
+                if publish_dir is None or not os.path.isdir(publish_dir):
+                    self.send_error(404)
+                    return
+
+                archive_name = os.path.basename(publish_dir) + ".zip"
+                self.send_response(200)
+                self.send_header("Content-Type", "application/zip")
+                self.send_header("Content-Disposition", f"attachment; filename*=UTF-8''{quote(archive_name)}")
+                self.end_headers()
+                try:
+                    stream_zip(publish_dir, self.wfile)
+                except (BrokenPipeError, ConnectionResetError):
+                    # 사용자가 다운로드를 취소한 경우
+                    pass
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("", port), Handler)
+        self.httpd.daemon_threads = True
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    # Function to expose a published directory as a zip download and return its URL path
+    def register(self, publish_dir):
+        with self.lock:
+            for token, registered_dir in self.archives.items():
+                if registered_dir == publish_dir:
+                    break
+            else:
+                token = secrets.token_urlsafe(16)
+                self.archives[token] = publish_dir
+        return f"/{token}/{quote(os.path.basename(publish_dir))}.zip"
@@ -0,0 +1,204 @@
+import os
+import sys
+import json
+import shutil
+import argparse
+import threading
+import subprocess
+
+from jobs import Job, PRIORITY_BACKGROUND, new_scratch_dir_path
+
+# 업로드 폴더 안에 미리 분석한 결과(타임라인, 미디어 정보)를 저장하는 폴더
+PREPARED_DIR_NAME = ".prepared"
+MEDIA_INFO_FILE_NAME = "media_info.json"
+PREPARED_TIMELINE_FILE_NAME = "timeline.json"
+
+# ffprobe 는 파일 머리 부분만 읽으므로 이 시간 안에 끝나지 않으면 미디어 정보 없이 진행
+PROBE_TIMEOUT_SECONDS = 30
+# 설정이 이 시간(초) 동안 바뀌지 않으면 미리 분석을 시작 (슬라이더를 움직일 때마다 분석을 다시 시작하지 않도록)
+PREPARE_IDLE_SECONDS = 3
+# 미리 분석 작업의 제한 시간 - 재생 시간을 알면 재생 시간의 2배 + 여유 시간, 모르면 기본값
+ANALYSIS_TIMEOUT_FACTOR = 2
+ANALYSIS_TIMEOUT_MARGIN_SECONDS = 60
+ANALYSIS_TIMEOUT_DEFAULT_SECONDS = 30 * 60
+
+INGEST_SCRIPT_PATH = os.path.abspath(__file__)
+
+
+def get_prepared_dir(source_path):
+    return os.path.join(os.path.dirname(source_path), PREPARED_DIR_NAME)
+
+def get_prepared_timeline_path(source_path, analysis_key):
+    return os.path.join(get_prepared_dir(source_path), analysis_key, PREPARED_TIMELINE_FILE_NAME)
+
+# Function to read basic media information (duration, streams) with ffprobe
+def probe_media(source_path):
+    try:
+        result = subprocess.run(
+            ["ffprobe", "-v", "error", "-show_entries", "format=duration:stream=codec_type,codec_name,width,height",
+             "-of", "json", source_path],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, universal_newlines=True,
+            timeout=PROBE_TIMEOUT_SECONDS
+        )
+        if result.returncode != 0:
+            return None
+        return json.loads(result.stdout)
+    except Exception:
+        # ffprobe가 없거나 출력을 읽을 수 없으면 미디어 정보 없이 분석만 진행
+        return None
+
+# Function to probe an ingested file and save its media information next to it
+def save_media_info(source_path):
+    media_info = probe_media(source_path)
+    if media_info is not None:
+        prepared_dir = get_prepared_dir(source_path)
+        os.makedirs(prepared_dir, exist_ok=True)
+        with open(os.path.join(prepared_dir, MEDIA_INFO_FILE_NAME), 'w', encoding='utf-8') as f:
+            json.dump(media_info, f)
+    return media_info
+
+# Function to load the media information saved by the preparation job (None if not probed yet)
+def load_media_info(source_path):
+    try:
+        with open(os.path.join(get_prepared_dir(source_path), MEDIA_INFO_FILE_NAME), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+# Function to get the time limit of a preparation job from the media duration
+def get_analysis_timeout(source_path):
+    media_info = load_media_info(source_path)
+    try:
+        duration = float(media_info["format"]["duration"])
+    except (TypeError, KeyError, ValueError):
+        return ANALYSIS_TIMEOUT_DEFAULT_SECONDS
+    return duration * ANALYSIS_TIMEOUT_FACTOR + ANALYSIS_TIMEOUT_MARGIN_SECONDS
+
+
+class AnalysisPreparer:
+    def __init__(self, job_manager, idle_seconds=PREPARE_IDLE_SECONDS):
+        self.job_manager = job_manager
+        self.idle_seconds = idle_seconds
+        self.job_ids = {}  # 분석 키 -> 미리 분석 작업 ID
+        self.wanted_keys = {}  # 요청한 쪽(세션) -> 현재 설정의 분석 키
+        self.pending = {}  # 요청한 쪽(세션) -> (분석 키, 파일 경로, 명령어 생성 함수, 대기 타이머)
+        self.lock = threading.Lock()
+
+    # Function to switch an owner (session) to a new analysis key: the previous preparation is cancelled and the new one
+    # is queued once the settings have stayed the same for idle_seconds (analysis_key None → only cancel)
+    def schedule(self, owner, analysis_key, source_path=None, analysis_cmd_builder=None):
+        with self.lock:
+            pending = self.pending.pop(owner, None)
+            if pending is not None:
+                pending[3].cancel()
+            previous_key = self.wanted_keys.pop(owner, None)
+            if analysis_key is not None:
+                self.wanted_keys[owner] = analysis_key
+            # 다른 세션이 같은 파일/설정을 기다리고 있으면 취소하지 않음
+            cancel_previous = previous_key not in (None, analysis_key) and previous_key not in self.wanted_keys.values()
+        if cancel_previous:
+            self.cancel(previous_key)
+        if analysis_key is None:
+            return
+
+        timer = threading.Timer(self.idle_seconds, self._start_pending, args=(owner, analysis_key))
+        timer.daemon = True
+        with self.lock:
+            self.pending[owner] = (analysis_key, source_path, analysis_cmd_builder, timer)
+        timer.start()
+
+    def _start_pending(self, owner, analysis_key):
+        with self.lock:
+            pending = self.pending.get(owner)
+            if pending is None or pending[0] != analysis_key:
+                return
+            del self.pending[owner]
+        try:
+            self.prepare(analysis_key, pending[1], pending[2])
+        except Exception:
+            # 파일이 삭제된 경우 등 - 작업을 시작할 때 직접 분석
+            pass
+
+    # Function to start a scheduled preparation right away (작업 시작 버튼을 누른 경우 대기 시간 없이 시작)
+    def start_now(self, analysis_key):
+        with self.lock:
+            owners = [owner for owner, pending in self.pending.items() if pending[0] == analysis_key]
+            pendings = [self.pending.pop(owner) for owner in owners]
+        for pending in pendings:
+            pending[3].cancel()
+        if pendings:
+            self.prepare(analysis_key, pendings[0][1], pendings[0][2])
+
+    # Function to queue the probing and analysis of an ingested file as one low-priority job
+    # (analysis_cmd_builder(출력 경로) → 타임라인을 만드는 auto-editor 명령어)
+    def prepare(self, analysis_key, source_path, analysis_cmd_builder):
+        if os.path.exists(get_prepared_timeline_path(source_path, analysis_key)):
+            return None
+        with self.lock:
+            job = self.job_manager.get(self.job_ids.get(analysis_key))
+            if job is not None and job.is_active:
+                return job.id
+            prepared_dir = get_prepared_dir(source_path)
+            scratch_dir = new_scratch_dir_path(prepared_dir)
+            cmds = [analysis_cmd_builder(os.path.join(scratch_dir, PREPARED_TIMELINE_FILE_NAME))]
+            # 미디어 정보(재생 시간)도 업로드 화면이 아닌 이 작업에서 먼저 확인
+            if load_media_info(source_path) is None:
+                cmds.insert(0, [sys.executable, INGEST_SCRIPT_PATH, "probe", source_path])
+            # 다른 작업이 자리를 차지하고 있으면 대기열에서 기다리고, 우선순위가 높은 작업이 오면 일시 정지됨
+            job = Job(
+                name=os.path.basename(source_path),
+                cmds=cmds,
+                scratch_dir=scratch_dir,
+                publish_dir=os.path.join(prepared_dir, analysis_key),
+                source_path=source_path,
+                priority=PRIORITY_BACKGROUND,
+                estimated_cost=os.path.getsize(source_path),
+                timeout_seconds=get_analysis_timeout(source_path)
+            )
+            self.job_ids[analysis_key] = self.job_manager.submit(job)
+            return job.id
+
+    # Function to get the preparation job that is still queued or running for an analysis key
+    def get_active_job(self, analysis_key):
+        with self.lock:
+            job = self.job_manager.get(self.job_ids.get(analysis_key))
+        return job if job is not None and job.is_active else None
+
+    # Function to cancel a preparation whose settings are no longer selected (kept if a job is waiting for it)
+    def cancel(self, analysis_key):
+        with self.lock:
+            job_id = self.job_ids.get(analysis_key)
+        if job_id is not None:
+            self.job_manager.cancel_unless_needed(job_id)
+
+
+# Function to copy a prepared timeline into the job's scratch directory,
+# or run the analysis itself when the preparation did not finish (failed, cancelled or timed out)
+def copy_prepared_timeline(timeline_path, dest_path, fallback_cmd):
+    if os.path.exists(timeline_path):
+        shutil.copyfile(timeline_path, dest_path)
+        print("미리 분석한 결과를 사용합니다.", flush=True)
+        print("Progress: 100%", flush=True)
+        return 0
+    print("미리 분석한 결과가 없어 다시 분석합니다.", flush=True)
+    return subprocess.call(fallback_cmd)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="업로드한 파일의 미리 분석 단계")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    probe_parser = subparsers.add_parser("probe", help="미디어 정보를 확인하여 업로드 폴더에 저장")
+    probe_parser.add_argument("source")
+    copy_parser = subparsers.add_parser("copy", help="미리 분석한 타임라인을 작업 폴더로 복사 (없으면 직접 분석)")
+    copy_parser.add_argument("timeline")
+    copy_parser.add_argument("dest")
+    copy_parser.add_argument("fallback_cmd", nargs=argparse.REMAINDER)
+    args = parser.parse_args()
+
+    if args.command == "probe":
+        # 미디어 정보가 없어도 분석은 계속 진행
+        save_media_info(args.source)
+        print("Progress: 100%", flush=True)
+        sys.exit(0)
+    fallback_cmd = args.fallback_cmd[1:] if args.fallback_cmd[:1] == ["--"] else args.fallback_cmd
+    sys.exit(copy_prepared_timeline(args.timeline, args.dest, fallback_cmd))
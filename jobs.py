@@ -0,0 +1,512 @@
+import os
+import re
+import json
+import uuid
+import shutil
+import hashlib
+import time
+import signal
+import subprocess
+import threading
+import itertools
+import datetime
+
+# 작업 우선순위 (값이 작을수록 먼저 실행)
+PRIORITY_INTERACTIVE = 0
+PRIORITY_NORMAL = 1
+PRIORITY_BATCH = 2
+# 업로드 직후 미리 시작하는 분석처럼 결과가 쓰이지 않을 수도 있는 작업 (사용자가 선택하는 우선순위 아님)
+PRIORITY_BACKGROUND = 3
+
+PRIORITY_LABELS = {
+    PRIORITY_INTERACTIVE: "높음 (빠른 작업)",
+    PRIORITY_NORMAL: "보통",
+    PRIORITY_BATCH: "낮음 (배치 작업)",
+    PRIORITY_BACKGROUND: "백그라운드 (미리 분석)",
+}
+
+# 작업 상태
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_PAUSED = "paused"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+STATUS_CANCELED = "canceled"
+
+STATUS_LABELS = {
+    STATUS_QUEUED: "대기 중",
+    STATUS_RUNNING: "처리 중",
+    STATUS_PAUSED: "일시 정지 (우선순위 높은 작업 처리 중)",
+    STATUS_DONE: "완료",
+    STATUS_FAILED: "실패",
+    STATUS_CANCELED: "취소됨",
+}
+
+ACTIVE_STATUSES = (STATUS_QUEUED, STATUS_RUNNING, STATUS_PAUSED)
+
+# 메모리에 보관하는 끝난(완료/실패/취소) 작업 수 (감시 폴더처럼 작업이 계속 쌓이는 경우 오래된 작업부터 제거)
+MAX_FINISHED_JOBS = 100
+
+# 취소 시 프로세스가 스스로 종료되기를 기다리는 시간(초), 이후 강제 종료
+TERMINATE_GRACE_SECONDS = 3
+# 제한 시간이 있는 작업의 실행 시간을 확인하는 주기(초)
+TIMEOUT_CHECK_SECONDS = 1
+
+# 작업별 임시 폴더가 만들어지는 위치 (결과 폴더와 같은 파일 시스템에 있어야 이동이 원자적으로 이루어짐)
+STAGING_DIR_NAME = ".staging"
+# 작업 임시 폴더를 만든 적이 있는 결과 폴더 목록 (프로젝트 폴더, 감시 폴더 등에 남은 임시 폴더도 정리하기 위해 저장)
+STAGING_ROOT_TRACKER_FILE = "staging_roots.json"
+MANIFEST_FILE_NAME = "manifest.json"
+
+# 실행 중인 작업을 일시 정지하고 다른 작업을 먼저 실행할 수 있는지 여부 (Windows는 프로세스 일시 정지 미지원)
+PREEMPTION_SUPPORTED = os.name != 'nt'
+
+
+class Job:
+    def __init__(self, name, cmds, scratch_dir, publish_dir, source_path=None, params=None,
+                 priority=PRIORITY_NORMAL, estimated_cost=0, on_success=None, archive_download=False,
+                 timeline_file=None, depends_on=None, timeout_seconds=None):
+        self.id = None
+        self.seq = None
+        self.name = name
+        self.cmds = cmds  # 순서대로 실행할 명령어 목록 (예: 타임라인 분석 → 클립 추출)
+        self.scratch_dir = scratch_dir  # auto-editor가 결과를 쓰는 작업 전용 폴더
+        self.publish_dir = publish_dir  # 완료 후 결과가 이동되는 폴더 (원본 파일/설정 기반 이름)
+        self.source_path = source_path
+        self.params = params or {}
+        self.priority = priority
+        self.estimated_cost = estimated_cost  # 짧은 작업을 먼저 실행하기 위한 예상 작업량 (입력 파일 크기)
+        self.on_success = on_success  # 완료 후 호출 (예: 프로젝트 파일 경로 수정)
+        self.archive_download = archive_download  # 결과 폴더를 ZIP으로 내려받을 수 있는지 여부
+        self.timeline_file = timeline_file  # 결과 폴더에 함께 저장되는 auto-editor 타임라인 (다시 렌더링할 때 재사용)
+        self.depends_on = depends_on  # 이 작업보다 먼저 끝나야 하는 작업 ID (예: 업로드 직후 시작한 미리 분석)
+        self.timeout_seconds = timeout_seconds  # 일시 정지 시간을 뺀 실행 시간 제한 (멈춘 작업이 계속 자리를 차지하지 않도록)
+        self.timed_out = False
+        self.status = STATUS_QUEUED
+        self.progress = 0
+        self.last_log = ""
+        self.returncode = None
+        self.created_at = datetime.datetime.now()
+        self.started_at = None
+        self.finished_at = None
+        self.paused_at = None
+        self.paused_seconds = 0  # 우선순위 높은 작업 때문에 일시 정지되어 있던 시간
+        self.reused = False  # 이미 게시된 결과를 재사용하여 실제로 처리하지 않은 경우
+        self.process = None
+        self.cancel_requested = False
+
+    @property
+    def is_active(self):
+        return self.status in ACTIVE_STATUSES
+
+    # 실행 시작부터 종료까지 걸린 시간(초) - 일시 정지되어 있던 시간은 제외
+    @property
+    def elapsed_seconds(self):
+        if self.started_at is None:
+            return None
+        now = self.finished_at or datetime.datetime.now()
+        paused_seconds = self.paused_seconds
+        if self.paused_at is not None:
+            paused_seconds += (now - self.paused_at).total_seconds()
+        return (now - self.started_at).total_seconds() - paused_seconds
+
+    def mark_paused(self):
+        self.paused_at = datetime.datetime.now()
+
+    def mark_resumed(self):
+        if self.paused_at is not None:
+            self.paused_seconds += (datetime.datetime.now() - self.paused_at).total_seconds()
+            self.paused_at = None
+
+    # 스케줄링 순서: 우선순위 → 예상 작업량(짧은 작업 먼저) → 제출 순서
+    def sort_key(self):
+        return (self.priority, self.estimated_cost, self.seq)
+
+
+# Function to start a command in its own process group so that the whole process tree can be signalled
+def start_process(cmd):
+    kwargs = {}
+    if os.name == 'nt':  # Windows
+        kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP
+    else:  # Unix/Linux/Mac
+        kwargs["start_new_session"] = True
+    return subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        universal_newlines=True,
+        bufsize=1,
+        **kwargs
+    )
+
+# Function to terminate a process and all of its children (auto-editor spawns ffmpeg)
+def kill_process_tree(process):
+    if process is None or process.poll() is not None:
+        return
+    if os.name == 'nt':  # Windows
+        try:
+            subprocess.run(["taskkill", "/F", "/T", "/PID", str(process.pid)],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except Exception:
+            process.kill()
+    else:  # Unix/Linux/Mac
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+            # 일시 정지된 프로세스는 SIGTERM을 처리하지 못하므로 재개
+            os.killpg(process.pid, signal.SIGCONT)
+        except ProcessLookupError:
+            return
+        try:
+            process.wait(timeout=TERMINATE_GRACE_SECONDS)
+        except subprocess.TimeoutExpired:
+            pass
+        # 종료되지 않은 프로세스와, 부모가 종료된 뒤에도 남아 CPU를 쓰는 자식 프로세스(ffmpeg 등)를 강제 종료
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+    try:
+        process.wait(timeout=TERMINATE_GRACE_SECONDS)
+    except subprocess.TimeoutExpired:
+        pass
+
+# Function to pause / resume a process tree (preemption, Unix only)
+def suspend_process_tree(process):
+    try:
+        os.killpg(process.pid, signal.SIGSTOP)
+        return True
+    except (ProcessLookupError, AttributeError):
+        return False
+
+def resume_process_tree(process):
+    try:
+        os.killpg(process.pid, signal.SIGCONT)
+        return True
+    except (ProcessLookupError, AttributeError):
+        return False
+
+# Function to build a short key from the source file and the edit settings (same input + same settings = same key)
+def make_output_key(source_path, params):
+    source_stat = os.stat(source_path)
+    identity = {
+        "source": os.path.basename(source_path),
+        "size": source_stat.st_size,
+        "mtime_ns": source_stat.st_mtime_ns,
+        "params": params,
+    }
+    return hashlib.sha256(json.dumps(identity, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
+# Function to load the list of result folders that have held scratch directories
+def load_staging_roots():
+    try:
+        if os.path.exists(STAGING_ROOT_TRACKER_FILE):
+            with open(STAGING_ROOT_TRACKER_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return []
+    except Exception:
+        return []
+
+# Function to save the list of result folders that have held scratch directories
+def save_staging_roots(staging_roots):
+    try:
+        with open(STAGING_ROOT_TRACKER_FILE, 'w', encoding='utf-8') as f:
+            json.dump(staging_roots, f, ensure_ascii=False)
+    except Exception:
+        pass
+
+# 화면과 감시 폴더 스레드에서 동시에 작업을 만들 수 있으므로 목록 파일 갱신을 잠금으로 보호
+staging_roots_lock = threading.Lock()
+
+def track_staging_root(publish_root):
+    with staging_roots_lock:
+        staging_roots = load_staging_roots()
+        if publish_root not in staging_roots:
+            staging_roots.append(publish_root)
+            save_staging_roots(staging_roots)
+
+# Function to pick a scratch directory for a job next to where its results will be published
+def new_scratch_dir_path(publish_root):
+    publish_root = os.path.abspath(publish_root)
+    track_staging_root(publish_root)
+    return os.path.join(publish_root, STAGING_DIR_NAME, uuid.uuid4().hex)
+
+def is_published(publish_dir):
+    return os.path.exists(os.path.join(publish_dir, MANIFEST_FILE_NAME))
+
+def file_sha256(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+# Function to write the manifest (artifacts, sizes and checksums) into the scratch directory before publishing
+def write_manifest(job):
+    artifacts = []
+    for root, dirs, files in os.walk(job.scratch_dir):
+        dirs.sort()
+        for file in sorted(files):
+            file_path = os.path.join(root, file)
+            artifacts.append({
+                "path": os.path.relpath(file_path, job.scratch_dir).replace(os.sep, "/"),
+                "size": os.path.getsize(file_path),
+                "sha256": file_sha256(file_path),
+            })
+    manifest = {
+        "job": job.name,
+        "source": job.source_path,
+        "params": job.params,
+        "timeline": job.timeline_file,
+        "created_at": datetime.datetime.now().isoformat(),
+        "artifacts": artifacts,
+    }
+    with open(os.path.join(job.scratch_dir, MANIFEST_FILE_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+# Function to publish a finished scratch directory with a single rename (readers never see half-written files)
+def publish_scratch_dir(scratch_dir, publish_dir):
+    try:
+        os.rename(scratch_dir, publish_dir)
+        return True
+    except OSError:
+        # 같은 파일/설정의 다른 작업이 먼저 게시한 경우 기존 결과를 유지
+        if is_published(publish_dir):
+            shutil.rmtree(scratch_dir, ignore_errors=True)
+            return False
+        raise
+
+# Function to remove scratch directories left behind by jobs that never finished (e.g. the app was killed)
+def cleanup_stale_scratch_dirs(publish_root, max_age_hours):
+    staging_root = os.path.join(publish_root, STAGING_DIR_NAME)
+    if not os.path.isdir(staging_root):
+        return 0
+    removed_count = 0
+    now = datetime.datetime.now()
+    for item in os.listdir(staging_root):
+        item_path = os.path.join(staging_root, item)
+        try:
+            modified_at = datetime.datetime.fromtimestamp(os.path.getmtime(item_path))
+            if (now - modified_at).total_seconds() / 3600 > max_age_hours:
+                shutil.rmtree(item_path, ignore_errors=True)
+                removed_count += 1
+        except OSError:
+            pass
+    return removed_count
+
+# Function to clean stale scratch directories under every result folder used by jobs (not only the output folder)
+def cleanup_all_stale_scratch_dirs(default_publish_root, max_age_hours):
+    removed_count = cleanup_stale_scratch_dirs(os.path.abspath(default_publish_root), max_age_hours)
+    with staging_roots_lock:
+        staging_roots = load_staging_roots()
+        # 삭제된 프로젝트 폴더 등 더 이상 없는 폴더는 목록에서 제거
+        existing_roots = [publish_root for publish_root in staging_roots if os.path.isdir(publish_root)]
+        if existing_roots != staging_roots:
+            save_staging_roots(existing_roots)
+    for publish_root in existing_roots:
+        if publish_root != os.path.abspath(default_publish_root):
+            removed_count += cleanup_stale_scratch_dirs(publish_root, max_age_hours)
+    return removed_count
+
+
+class JobManager:
+    def __init__(self, max_running=1, max_finished_jobs=MAX_FINISHED_JOBS):
+        self.max_running = max_running
+        self.max_finished_jobs = max_finished_jobs
+        self.jobs = {}
+        self.lock = threading.RLock()
+        # 일시 정지된 작업이 다시 실행되거나 취소되면 알림 (단계 사이에 멈춘 작업이 다음 단계를 시작하도록)
+        self.resumed = threading.Condition(self.lock)
+        self._seq = itertools.count(1)
+
+    def submit(self, job):
+        with self.lock:
+            job.seq = next(self._seq)
+            job.id = f"job-{job.seq}"
+            self.jobs[job.id] = job
+            # 기다리는 작업보다 선행 작업의 우선순위가 낮으면 선행 작업이 밀려 계속 기다리지 않도록 우선순위를 올림
+            dependency = self.jobs.get(job.depends_on)
+            if dependency is not None and dependency.priority > job.priority:
+                dependency.priority = job.priority
+            self._schedule()
+        return job.id
+
+    def get(self, job_id):
+        return self.jobs.get(job_id)
+
+    def list_jobs(self):
+        with self.lock:
+            return sorted(self.jobs.values(), key=lambda job: job.seq)
+
+    # 대기열에서 몇 번째로 실행될지 (1부터 시작, 대기 중이 아니면 None)
+    def queue_position(self, job_id):
+        with self.lock:
+            waiting = sorted((job for job in self.jobs.values() if job.status == STATUS_QUEUED),
+                             key=Job.sort_key)
+            for position, job in enumerate(waiting, start=1):
+                if job.id == job_id:
+                    return position
+        return None
+
+    def cancel(self, job_id):
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None or not job.is_active:
+                return False
+            job.cancel_requested = True
+            # 이 작업만을 위해 실행 중인 선행 작업도 함께 취소
+            dependency_id = job.depends_on
+            if job.status == STATUS_QUEUED:
+                job.status = STATUS_CANCELED
+                job.last_log = "실행 전에 취소되었습니다."
+                self._prune_finished_jobs()
+                process = None
+            else:
+                process = job.process
+                self.resumed.notify_all()
+        # 프로세스 종료는 잠금 밖에서 수행 (작업 스레드가 결과를 정리하고 다음 작업을 시작함)
+        kill_process_tree(process)
+        if dependency_id is not None:
+            self.cancel_unless_needed(dependency_id)
+        return True
+
+    # Function to cancel a job unless another active job is waiting for its result
+    def cancel_unless_needed(self, job_id):
+        with self.lock:
+            if any(job.depends_on == job_id and job.is_active for job in self.jobs.values()):
+                return False
+        return self.cancel(job_id)
+
+    # 선행 작업이 아직 끝나지 않은 작업은 실행하지 않음 (선행 작업이 실패/취소되어도 끝나면 실행)
+    def _is_waiting_for_dependency(self, job):
+        dependency = self.jobs.get(job.depends_on)
+        return dependency is not None and dependency.is_active
+
+    # Function to forget the oldest finished jobs so that the job list stays bounded (must be called with the lock held)
+    def _prune_finished_jobs(self):
+        finished = sorted((job for job in self.jobs.values() if not job.is_active), key=lambda job: job.seq)
+        for job in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+            del self.jobs[job.id]
+
+    # Function to start, resume or preempt jobs (must be called with the lock held)
+    def _schedule(self):
+        running = [job for job in self.jobs.values() if job.status == STATUS_RUNNING]
+        waiting = sorted((job for job in self.jobs.values()
+                          if job.status in (STATUS_QUEUED, STATUS_PAUSED) and not self._is_waiting_for_dependency(job)),
+                         key=Job.sort_key)
+
+        for job in waiting:
+            if len(running) < self.max_running:
+                self._run_or_resume(job)
+                running.append(job)
+                continue
+
+            # 빈 자리가 없으면 우선순위가 더 낮은 실행 중 작업을 일시 정지
+            if not PREEMPTION_SUPPORTED:
+                break
+            victim = max(running, key=Job.sort_key)
+            if victim.priority <= job.priority or victim.process is None:
+                break
+            if suspend_process_tree(victim.process):
+                victim.status = STATUS_PAUSED
+                victim.mark_paused()
+                running.remove(victim)
+                self._run_or_resume(job)
+                running.append(job)
+            else:
+                break
+
+    def _run_or_resume(self, job):
+        if job.status == STATUS_PAUSED:
+            resume_process_tree(job.process)
+            job.mark_resumed()
+            job.status = STATUS_RUNNING
+            self.resumed.notify_all()
+            return
+        job.status = STATUS_RUNNING
+        threading.Thread(target=self._run_job, args=(job,), daemon=True).start()
+
+    def _run_job(self, job):
+        job.started_at = datetime.datetime.now()
+        try:
+            # 같은 파일, 같은 설정으로 이미 게시된 결과가 있으면 다시 처리하지 않음
+            if is_published(job.publish_dir):
+                job.reused = True
+                job.progress = 100
+                job.status = STATUS_DONE
+                job.last_log = "같은 설정으로 처리된 결과가 이미 있어 재사용합니다."
+                return
+
+            os.makedirs(job.scratch_dir, exist_ok=True)
+            if job.timeout_seconds is not None:
+                threading.Thread(target=self._watch_timeout, args=(job,), daemon=True).start()
+            for step_index, cmd in enumerate(job.cmds):
+                job.returncode = self._run_step(job, step_index, cmd)
+                if job.cancel_requested:
+                    raise InterruptedError
+                if job.returncode != 0:
+                    break
+
+            if job.returncode != 0:
+                job.status = STATUS_FAILED
+                if job.timed_out:
+                    job.last_log = f"제한 시간({job.timeout_seconds:.0f}초)을 넘겨 작업을 중단했습니다."
+            else:
+                if job.on_success is not None:
+                    job.on_success(job)
+                write_manifest(job)
+                publish_scratch_dir(job.scratch_dir, job.publish_dir)
+                job.progress = 100
+                job.status = STATUS_DONE
+        except InterruptedError:
+            job.status = STATUS_CANCELED
+            job.last_log = "작업이 취소되었습니다. 생성 중이던 결과 파일을 삭제했습니다."
+        except Exception as e:
+            kill_process_tree(job.process)
+            job.status = STATUS_FAILED
+            job.last_log = f"작업 실행 중 오류 발생: {str(e)}"
+        finally:
+            if job.process is not None and job.process.stdout is not None:
+                job.process.stdout.close()
+            # 취소/실패한 작업의 임시 폴더 삭제 (게시된 경우 이미 이동되어 존재하지 않음)
+            shutil.rmtree(job.scratch_dir, ignore_errors=True)
+            job.finished_at = datetime.datetime.now()
+            # 일시 정지 중에 취소된 경우 정지 시간을 마저 계산
+            job.mark_resumed()
+            with self.lock:
+                self._prune_finished_jobs()
+                self._schedule()
+
+    # Function to kill a job that runs longer than its time limit (paused time does not count)
+    def _watch_timeout(self, job):
+        while job.is_active:
+            if job.status == STATUS_RUNNING and job.elapsed_seconds > job.timeout_seconds:
+                # 단계 사이에 시간이 지나도 다음 단계가 시작되지 않도록 잠금 안에서 표시
+                with self.lock:
+                    job.timed_out = True
+                    process = job.process
+                kill_process_tree(process)
+                return
+            time.sleep(TIMEOUT_CHECK_SECONDS)
+
+    def _run_step(self, job, step_index, cmd):
+        with self.lock:
+            # 이전 단계가 끝나는 순간 일시 정지된 경우, 다시 실행될 때까지 다음 단계를 시작하지 않음
+            while job.status == STATUS_PAUSED and not job.cancel_requested:
+                self.resumed.wait()
+            if job.cancel_requested:
+                raise InterruptedError
+            if job.timed_out:
+                return -1
+            if job.process is not None and job.process.stdout is not None:
+                job.process.stdout.close()
+            job.process = start_process(cmd)
+
+        # 진행 상황 추적 및 업데이트 (여러 단계인 경우 전체 진행률로 환산)
+        for line in job.process.stdout:
+            job.last_log = line.strip()
+            if "%" in line and "Progress:" in line:
+                percentage_match = re.search(r'(\d+)%', line)
+                if percentage_match:
+                    step_progress = int(percentage_match.group(1))
+                    job.progress = (step_index * 100 + step_progress) // len(job.cmds)
+        return job.process.wait()
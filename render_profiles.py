@@ -0,0 +1,13 @@
+# MP4 렌더링 품질 프로필 (초안은 컷 확인용으로 해상도/비트레이트를 낮춰 빠르게 렌더링)
+RENDER_PROFILE_FINAL = "final"
+RENDER_PROFILE_DRAFT = "draft"
+RENDER_PROFILES = {
+    RENDER_PROFILE_FINAL: {"label": "최종 (원본 해상도)", "options": []},
+    RENDER_PROFILE_DRAFT: {"label": "초안 (빠른 확인용)",
+                           "options": ["--scale", "0.5", "--video-bitrate", "1M", "--audio-bitrate", "96k"]},
+}
+
+
+# Function to build the command that renders a stored auto-editor timeline with a render profile
+def build_render_command(timeline_path, output_path, render_profile):
+    return ["auto-editor", timeline_path, "--output", output_path] + RENDER_PROFILES[render_profile]["options"]
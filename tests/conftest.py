@@ -0,0 +1,7 @@
+import os
+import sys
+
+# 테스트에서 앱 모듈(jobs, clips 등)을 바로 import 할 수 있도록 저장소 루트를 경로에 추가
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
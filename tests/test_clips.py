@@ -0,0 +1,56 @@
+import json
+
+import pytest
+
+from clips import KEYFRAME_TOLERANCE_SECONDS, load_segments, starts_on_keyframe
+
+
+def write_timeline(tmp_path, timeline):
+    timeline_path = tmp_path / "timeline.json"
+    timeline_path.write_text(json.dumps(timeline))
+    return str(timeline_path)
+
+
+def test_segments_are_source_seconds_from_offset_and_duration(tmp_path):
+    # 30000/1001 fps 타임라인: offset 은 원본 위치, dur 는 타임라인 길이 (프레임 단위)
+    timeline_path = write_timeline(tmp_path, {
+        "timebase": "30000/1001",
+        "v": [[
+            {"src": "0", "start": 0, "offset": 300, "dur": 90, "speed": 1},
+            {"src": "0", "start": 90, "offset": 30, "dur": 60},
+        ]],
+        "a": [[{"src": "0", "start": 0, "offset": 0, "dur": 999}]],
+    })
+
+    segments = load_segments(timeline_path)
+
+    # 원본 위치 순서로 정렬되고, 비디오 트랙이 있으면 비디오 트랙 기준
+    assert segments == [
+        pytest.approx((30 * 1001 / 30000, 90 * 1001 / 30000)),
+        pytest.approx((300 * 1001 / 30000, 390 * 1001 / 30000)),
+    ]
+
+
+def test_segment_length_in_source_is_duration_times_speed(tmp_path):
+    # 2배속 구간은 타임라인에서 50프레임이지만 원본에서는 100프레임
+    timeline_path = write_timeline(tmp_path, {
+        "timebase": "25",
+        "a": [[{"src": "0", "start": 0, "offset": 50, "dur": 50, "speed": 2.0}]],
+    })
+
+    assert load_segments(timeline_path) == [pytest.approx((2.0, 6.0))]
+
+
+def test_timeline_without_tracks_has_no_segments(tmp_path):
+    assert load_segments(write_timeline(tmp_path, {"timebase": "30", "v": [], "a": []})) == []
+
+
+def test_starts_on_keyframe_only_when_keyframe_is_just_before_the_cut():
+    keyframes = [0.0, 2.0, 4.0]
+
+    assert starts_on_keyframe(2.0, keyframes)
+    assert starts_on_keyframe(2.0 + KEYFRAME_TOLERANCE_SECONDS / 2, keyframes)
+    # 키프레임보다 앞에서 자르거나 키프레임에서 너무 멀면 스트림 복사 불가
+    assert not starts_on_keyframe(2.0 - KEYFRAME_TOLERANCE_SECONDS / 2, keyframes)
+    assert not starts_on_keyframe(2.5, keyframes)
+    assert not starts_on_keyframe(1.0, [])
@@ -0,0 +1,45 @@
+import io
+import os
+import zipfile
+
+from jobs import Job, write_manifest
+from download_server import list_published_files, stream_zip
+
+
+class UnseekableStream(io.RawIOBase):
+    # HTTP 응답처럼 앞으로 되돌아갈 수 없는 출력 스트림
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.buffer.extend(data)
+        return len(data)
+
+
+def make_clip_result(tmp_path):
+    publish_dir = tmp_path / "example_clips"
+    clip_dir = publish_dir / "example_clips"
+    clip_dir.mkdir(parents=True)
+    for index in range(1, 4):
+        (clip_dir / f"example_clips-{index:04d}.mp4").write_bytes(os.urandom(1024))
+    (publish_dir / "example_clips_timeline.json").write_text("{}")
+
+    job = Job("example.mp4", [], scratch_dir=str(publish_dir), publish_dir=str(publish_dir),
+              timeline_file="example_clips_timeline.json")
+    write_manifest(job)
+    return publish_dir
+
+
+def test_zip_contains_clips_but_not_the_analysis_timeline(tmp_path):
+    publish_dir = make_clip_result(tmp_path)
+    expected = [f"example_clips/example_clips-{index:04d}.mp4" for index in range(1, 4)]
+    assert list_published_files(str(publish_dir)) == expected
+
+    stream = UnseekableStream()
+    stream_zip(str(publish_dir), stream)
+    with zipfile.ZipFile(io.BytesIO(bytes(stream.buffer))) as archive:
+        assert archive.namelist() == expected
+        assert archive.read(expected[0]) == (publish_dir / expected[0]).read_bytes()
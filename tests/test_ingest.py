@@ -0,0 +1,74 @@
+import os
+import time
+
+import pytest
+
+from jobs import JobManager, STATUS_DONE, STATUS_CANCELED
+from ingest import AnalysisPreparer, get_prepared_timeline_path
+
+pytestmark = pytest.mark.skipif(os.name == 'nt', reason="분석 명령어 대신 sh 를 사용함")
+
+IDLE_SECONDS = 0.2
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return condition()
+
+
+@pytest.fixture
+def source_path(tmp_path, monkeypatch):
+    # 작업 임시 폴더 목록은 현재 폴더에 저장되므로 테스트마다 분리
+    monkeypatch.chdir(tmp_path)
+    source = tmp_path / "upload" / "take1.mp4"
+    source.parent.mkdir()
+    source.write_bytes(b"\0" * 1024)
+    return str(source)
+
+
+# auto-editor 대신 타임라인 파일만 만드는 분석 명령어
+def analysis_cmd_builder(timeline_path):
+    return ["sh", "-c", f"echo '{{}}' > '{timeline_path}'"]
+
+def make_preparer():
+    return AnalysisPreparer(JobManager(max_running=1), idle_seconds=IDLE_SECONDS)
+
+
+def test_analysis_starts_only_after_settings_stay_unchanged(source_path):
+    preparer = make_preparer()
+    # 슬라이더를 여러 번 움직이는 동안에는 작업을 만들지 않음
+    for key in ["key1", "key2", "key3"]:
+        preparer.schedule("session", key, source_path, analysis_cmd_builder)
+    assert preparer.job_manager.list_jobs() == []
+
+    assert wait_until(lambda: os.path.exists(get_prepared_timeline_path(source_path, "key3")))
+    assert [job.status for job in preparer.job_manager.list_jobs()] == [STATUS_DONE]
+    assert not os.path.exists(get_prepared_timeline_path(source_path, "key1"))
+
+
+def test_changing_settings_cancels_the_started_analysis(source_path):
+    preparer = make_preparer()
+    slow_builder = lambda timeline_path: ["sh", "-c", "sleep 30"]
+    preparer.schedule("session", "key1", source_path, slow_builder)
+    assert wait_until(lambda: preparer.get_active_job("key1") is not None)
+    job = preparer.get_active_job("key1")
+
+    preparer.schedule("session", "key2", source_path, analysis_cmd_builder)
+    assert wait_until(lambda: job.status == STATUS_CANCELED)
+    # 설정을 선택하지 않는 형식으로 바꾸면 예약된 분석도 시작하지 않음
+    preparer.schedule("session", None)
+    time.sleep(IDLE_SECONDS * 2)
+    assert preparer.get_active_job("key2") is None
+    assert not os.path.exists(get_prepared_timeline_path(source_path, "key2"))
+
+
+def test_start_now_skips_the_idle_wait(source_path):
+    preparer = AnalysisPreparer(JobManager(max_running=1), idle_seconds=60)
+    preparer.schedule("session", "key1", source_path, analysis_cmd_builder)
+
+    preparer.start_now("key1")
+    assert wait_until(lambda: os.path.exists(get_prepared_timeline_path(source_path, "key1")))
@@ -0,0 +1,309 @@
+import os
+import time
+import signal
+import shutil
+import datetime
+
+import pytest
+
+from jobs import (Job, JobManager, PREEMPTION_SUPPORTED, PRIORITY_INTERACTIVE, PRIORITY_NORMAL, PRIORITY_BATCH,
+                  PRIORITY_BACKGROUND, STATUS_QUEUED, STATUS_RUNNING, STATUS_PAUSED, STATUS_DONE, STATUS_FAILED,
+                  STATUS_CANCELED, TERMINATE_GRACE_SECONDS, TIMEOUT_CHECK_SECONDS,
+                  new_scratch_dir_path, cleanup_all_stale_scratch_dirs, load_staging_roots)
+
+pytestmark = pytest.mark.skipif(os.name == 'nt', reason="프로세스 그룹 확인에 /proc 과 sh 가 필요함")
+
+# auto-editor 가 ffmpeg 을 띄우는 것처럼 자식 프로세스를 여러 개 만드는 명령어
+TREE_CMD = ["sh", "-c", "sleep 30 & sleep 30 & wait"]
+# 취소 후 모든 프로세스가 사라질 때까지 허용하는 시간(초)
+CPU_RELEASE_SECONDS = 0.5
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return condition()
+
+def read_proc_stat(pid):
+    with open(f"/proc/{pid}/stat") as f:
+        # 프로세스 이름에 공백이 있을 수 있으므로 마지막 ')' 뒤에서 나눔
+        fields = f.read().rsplit(")", 1)[1].split()
+    return fields[0], int(fields[2])  # 상태, 프로세스 그룹
+
+# Function to list the live (non-zombie) processes of a process group with their states
+def group_processes(pgid):
+    processes = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            state, entry_pgid = read_proc_stat(entry)
+        except (OSError, IndexError, ValueError):
+            continue
+        if entry_pgid == pgid and state != "Z":
+            processes[int(entry)] = state
+    return processes
+
+def kill_process_group(pgid):
+    try:
+        os.killpg(pgid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+def make_job(tmp_path, name, cmds, priority=PRIORITY_NORMAL, estimated_cost=0, depends_on=None, timeout_seconds=None):
+    return Job(name, cmds,
+               scratch_dir=str(tmp_path / ".staging" / name),
+               publish_dir=str(tmp_path / name),
+               priority=priority, estimated_cost=estimated_cost,
+               depends_on=depends_on, timeout_seconds=timeout_seconds)
+
+def start_tree_job(manager, tmp_path, name, priority=PRIORITY_NORMAL):
+    job = make_job(tmp_path, name, [TREE_CMD], priority=priority)
+    manager.submit(job)
+    # sh 와 sleep 두 개가 모두 실행될 때까지 대기
+    assert wait_until(lambda: job.process is not None and len(group_processes(job.process.pid)) == 3)
+    return job
+
+
+def test_cancel_kills_whole_process_tree_promptly(tmp_path):
+    manager = JobManager(max_running=1)
+    job = start_tree_job(manager, tmp_path, "long")
+    pgid = job.process.pid
+
+    started = time.monotonic()
+    assert manager.cancel(job.id)
+    # sleep 은 SIGTERM 으로 바로 종료되므로 강제 종료 대기 시간까지 가지 않아야 함
+    assert time.monotonic() - started < TERMINATE_GRACE_SECONDS
+    # 남은 자식 프로세스는 강제 종료 신호를 받았으므로 곧바로 사라져야 함
+    assert wait_until(lambda: group_processes(pgid) == {}, timeout=CPU_RELEASE_SECONDS)
+    assert wait_until(lambda: job.status == STATUS_CANCELED)
+
+
+def test_cancel_kills_children_that_ignore_sigterm(tmp_path):
+    manager = JobManager(max_running=1)
+    job = make_job(tmp_path, "stubborn", [["sh", "-c", "sh -c 'trap \"\" TERM; while :; do :; done' & wait"]])
+    manager.submit(job)
+    assert wait_until(lambda: job.process is not None and len(group_processes(job.process.pid)) == 2)
+    pgid = job.process.pid
+
+    manager.cancel(job.id)
+    assert wait_until(lambda: group_processes(pgid) == {}, timeout=CPU_RELEASE_SECONDS)
+
+
+def test_cancel_removes_scratch_dir(tmp_path):
+    manager = JobManager(max_running=1)
+    job = start_tree_job(manager, tmp_path, "partial")
+    with open(os.path.join(job.scratch_dir, "partial.mp4"), "wb") as f:
+        f.write(b"\0" * 1024)
+
+    manager.cancel(job.id)
+    assert wait_until(lambda: job.status == STATUS_CANCELED and job.finished_at is not None)
+    assert not os.path.exists(job.scratch_dir)
+    assert not os.path.exists(job.publish_dir)
+
+
+def test_cancel_queued_job_never_starts(tmp_path):
+    manager = JobManager(max_running=1)
+    running = start_tree_job(manager, tmp_path, "running")
+    queued = make_job(tmp_path, "queued", [["sh", "-c", "exit 0"]])
+    manager.submit(queued)
+
+    assert manager.cancel(queued.id)
+    assert queued.status == STATUS_CANCELED
+    manager.cancel(running.id)
+    assert wait_until(lambda: running.status == STATUS_CANCELED)
+    assert queued.started_at is None
+
+
+@pytest.mark.skipif(not PREEMPTION_SUPPORTED, reason="프로세스 일시 정지 미지원")
+def test_interactive_job_preempts_and_resumes_batch_job(tmp_path):
+    manager = JobManager(max_running=1)
+    batch = start_tree_job(manager, tmp_path, "batch", priority=PRIORITY_BATCH)
+    pgid = batch.process.pid
+
+    interactive = make_job(tmp_path, "interactive", [["sh", "-c", "sleep 0.5"]], priority=PRIORITY_INTERACTIVE)
+    manager.submit(interactive)
+    assert batch.status == STATUS_PAUSED
+    assert interactive.status == STATUS_RUNNING
+    # 일시 정지된 작업의 모든 프로세스가 CPU를 사용하지 않는 정지 상태
+    assert set(group_processes(pgid).values()) == {"T"}
+
+    assert wait_until(lambda: interactive.status == STATUS_DONE)
+    assert wait_until(lambda: batch.status == STATUS_RUNNING)
+    assert wait_until(lambda: "T" not in group_processes(pgid).values())
+    # 일시 정지되어 있던 시간은 처리 시간에서 제외
+    wall_seconds = (datetime.datetime.now() - batch.started_at).total_seconds()
+    assert batch.paused_seconds >= 0.4
+    assert batch.elapsed_seconds <= wall_seconds - batch.paused_seconds + 0.05
+
+    manager.cancel(batch.id)
+    assert wait_until(lambda: group_processes(pgid) == {}, timeout=CPU_RELEASE_SECONDS)
+
+
+def test_queued_jobs_run_in_sort_key_order(tmp_path):
+    manager = JobManager(max_running=1)
+    # 대기열을 채우는 동안 다른 작업이 시작되지 않도록 가장 높은 우선순위 작업으로 자리를 차지
+    blocker = start_tree_job(manager, tmp_path, "blocker", priority=PRIORITY_INTERACTIVE)
+
+    order_file = tmp_path / "order.txt"
+    submitted = [
+        ("batch-small", PRIORITY_BATCH, 1),
+        ("normal-large", PRIORITY_NORMAL, 300),
+        ("interactive", PRIORITY_INTERACTIVE, 500),
+        ("normal-small", PRIORITY_NORMAL, 10),
+        ("normal-small-later", PRIORITY_NORMAL, 10),
+    ]
+    jobs = []
+    for name, priority, cost in submitted:
+        job = make_job(tmp_path, name, [["sh", "-c", f"echo {name} >> '{order_file}'"]],
+                       priority=priority, estimated_cost=cost)
+        manager.submit(job)
+        jobs.append(job)
+
+    expected = [job.name for job in sorted(jobs, key=Job.sort_key)]
+    assert [manager.queue_position(job.id) for job in jobs] == [expected.index(job.name) + 1 for job in jobs]
+
+    manager.cancel(blocker.id)
+    assert wait_until(lambda: all(job.status == STATUS_DONE for job in jobs))
+    assert order_file.read_text().split() == expected
+    assert expected == ["interactive", "normal-small", "normal-small-later", "normal-large", "batch-small"]
+
+
+def test_stale_scratch_dirs_are_cleaned_in_every_used_root(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    output_root = tmp_path / "output"
+    # 프로젝트 내보내기/감시 폴더처럼 출력 폴더 밖에 만들어지는 임시 폴더
+    project_root = tmp_path / "project"
+    watched_root = tmp_path / "watched"
+
+    stale_dirs = [new_scratch_dir_path(str(root)) for root in (output_root, project_root, watched_root)]
+    fresh_dir = new_scratch_dir_path(str(project_root))
+    old_time = time.time() - 48 * 3600
+    for scratch_dir in stale_dirs + [fresh_dir]:
+        os.makedirs(scratch_dir)
+    for scratch_dir in stale_dirs:
+        os.utime(scratch_dir, (old_time, old_time))
+
+    assert cleanup_all_stale_scratch_dirs(str(output_root), max_age_hours=24) == 3
+    assert not any(os.path.exists(scratch_dir) for scratch_dir in stale_dirs)
+    assert os.path.exists(fresh_dir)
+
+    # 삭제된 폴더는 추적 목록에서 제외
+    shutil.rmtree(watched_root)
+    cleanup_all_stale_scratch_dirs(str(output_root), max_age_hours=24)
+    assert str(watched_root) not in load_staging_roots()
+    assert str(project_root) in load_staging_roots()
+
+
+def test_only_the_most_recent_finished_jobs_are_kept(tmp_path):
+    manager = JobManager(max_running=1, max_finished_jobs=2)
+    jobs = []
+    for index in range(4):
+        job = make_job(tmp_path, f"take{index}", [["sh", "-c", "exit 0"]])
+        manager.submit(job)
+        jobs.append(job)
+        assert wait_until(lambda: job.status == STATUS_DONE and job.finished_at is not None)
+
+    assert wait_until(lambda: [job.name for job in manager.list_jobs()] == ["take2", "take3"])
+    assert manager.get(jobs[0].id) is None
+
+
+def test_already_published_result_is_reused_without_running(tmp_path):
+    manager = JobManager(max_running=1)
+    first = make_job(tmp_path, "take", [["sh", "-c", "exit 0"]])
+    manager.submit(first)
+    assert wait_until(lambda: first.status == STATUS_DONE)
+    assert not first.reused
+
+    again = make_job(tmp_path, "take", [["sh", "-c", "exit 1"]])
+    manager.submit(again)
+    assert wait_until(lambda: again.status == STATUS_DONE)
+    assert again.reused
+
+
+def test_dependent_job_waits_without_taking_a_slot(tmp_path):
+    manager = JobManager(max_running=1)
+    prepared = make_job(tmp_path, "prepared", [["sh", "-c", "sleep 0.5; exit 1"]], priority=PRIORITY_BACKGROUND)
+    manager.submit(prepared)
+    dependent = make_job(tmp_path, "dependent", [["sh", "-c", "exit 0"]], depends_on=prepared.id)
+    manager.submit(dependent)
+
+    # 대기 중인 작업이 선행 작업을 일시 정지시키지 않고, 선행 작업은 대기 작업의 우선순위를 물려받음
+    assert dependent.status == STATUS_QUEUED
+    assert prepared.status == STATUS_RUNNING
+    assert prepared.priority == PRIORITY_NORMAL
+
+    # 선행 작업이 끝나면 (실패해도) 대기 작업이 실행됨
+    assert wait_until(lambda: prepared.status == STATUS_FAILED)
+    assert wait_until(lambda: dependent.status == STATUS_DONE)
+
+
+def test_cancel_also_cancels_dependency_nobody_else_needs(tmp_path):
+    manager = JobManager(max_running=1)
+    prepared = start_tree_job(manager, tmp_path, "prepared", priority=PRIORITY_BACKGROUND)
+    pgid = prepared.process.pid
+    first = make_job(tmp_path, "first", [["sh", "-c", "exit 0"]], depends_on=prepared.id)
+    second = make_job(tmp_path, "second", [["sh", "-c", "exit 0"]], depends_on=prepared.id)
+    manager.submit(first)
+    manager.submit(second)
+
+    # 다른 작업이 아직 기다리고 있으면 선행 작업은 유지
+    manager.cancel(first.id)
+    assert prepared.is_active
+    assert not manager.cancel_unless_needed(prepared.id)
+
+    manager.cancel(second.id)
+    assert wait_until(lambda: prepared.status == STATUS_CANCELED)
+    assert wait_until(lambda: group_processes(pgid) == {}, timeout=CPU_RELEASE_SECONDS)
+
+
+def test_job_over_time_limit_is_killed(tmp_path):
+    manager = JobManager(max_running=1)
+    hung = make_job(tmp_path, "hung", [TREE_CMD, ["sh", "-c", "exit 0"]], timeout_seconds=0.5)
+    manager.submit(hung)
+    assert wait_until(lambda: hung.process is not None)
+    pgid = hung.process.pid
+
+    assert wait_until(lambda: hung.status == STATUS_FAILED, timeout=0.5 + TIMEOUT_CHECK_SECONDS + 2)
+    assert hung.timed_out
+    assert "제한 시간" in hung.last_log
+    assert group_processes(pgid) == {}
+    assert not os.path.exists(hung.publish_dir)
+
+
+@pytest.mark.skipif(not PREEMPTION_SUPPORTED, reason="프로세스 일시 정지 미지원")
+def test_job_paused_between_steps_does_not_start_next_step(tmp_path):
+    manager = JobManager(max_running=1)
+    go = tmp_path / "finish_first_step"
+    marker = tmp_path / "second_step_started"
+    # 첫 단계는 프로세스 그룹에 자식을 남기고 끝나므로 단계 사이에도 일시 정지 신호가 성공함
+    first_step = f"sleep 30 > /dev/null 2>&1 & while [ ! -e '{go}' ]; do sleep 0.01; done"
+    batch = make_job(tmp_path, "batch", [["sh", "-c", first_step], ["sh", "-c", f"touch '{marker}'"]],
+                     priority=PRIORITY_BATCH)
+    interactive = make_job(tmp_path, "interactive", [["sh", "-c", "sleep 0.5"]], priority=PRIORITY_INTERACTIVE)
+    first_step_pgid = None
+    try:
+        manager.submit(batch)
+        assert wait_until(lambda: batch.process is not None)
+        first_step_pgid = batch.process.pid
+        # 첫 단계가 끝난 뒤 다음 단계를 시작하기 전에 높은 우선순위 작업이 들어온 경우
+        # (잠금을 잡고 있는 동안에는 작업 스레드가 다음 단계를 시작할 수 없음)
+        with manager.lock:
+            go.touch()
+            assert wait_until(lambda: batch.process.poll() is not None)
+            manager.submit(interactive)
+            assert batch.status == STATUS_PAUSED
+            assert interactive.status == STATUS_RUNNING
+
+        # 일시 정지된 작업은 다시 실행될 때까지 다음 단계를 시작하지 않음 (실행 자리는 하나)
+        time.sleep(0.3)
+        assert not marker.exists()
+        assert wait_until(lambda: interactive.status == STATUS_DONE)
+        assert wait_until(lambda: batch.status == STATUS_DONE)
+        assert marker.exists()
+    finally:
+        if first_step_pgid is not None:
+            kill_process_group(first_step_pgid)
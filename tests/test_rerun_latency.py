@@ -0,0 +1,92 @@
+import os
+import json
+import time
+import atexit
+import datetime
+import functools
+import tempfile
+
+import pytest
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+import watch_folders
+from conftest import REPO_ROOT
+
+APP_PATH = os.path.join(REPO_ROOT, "app.py")
+TRACKED_UPLOAD_COUNT = 1000
+RERUN_COUNT = 40
+# 위젯 조작 한 번에 대한 스크립트 재실행 시간 목표 (p95)
+RERUN_P95_BUDGET_MS = 50
+# 기준 측정용: 앱과 같은 소스를 컴파일하되 슬라이더 하나만 그리고 실행을 멈춤
+BASELINE_PREAMBLE = "import streamlit as st\nst.slider('baseline', -60.0, 0.0, -30.0)\nst.stop()\n"
+
+
+@pytest.fixture
+def isolated_app(tmp_path, monkeypatch):
+    # 앱이 시스템 임시 폴더와 현재 폴더의 추적 파일을 정리/감시하므로 모두 테스트 폴더 안으로 제한
+    temp_dir = tmp_path / "tmp"
+    temp_dir.mkdir()
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("TMPDIR", str(temp_dir))
+    monkeypatch.setattr(tempfile, "tempdir", str(temp_dir))
+    # pytest 종료 시 임시 폴더를 지우는 종료 처리기가 등록되지 않도록 함
+    monkeypatch.setattr(atexit, "register", lambda func, *args, **kwargs: func)
+    # 테스트가 끝난 뒤에도 감시 스레드가 남아 다른 폴더를 확인하지 않도록 스레드 없이 생성
+    monkeypatch.setattr(watch_folders, "FolderWatcher", functools.partial(watch_folders.FolderWatcher, start=False))
+    st.cache_resource.clear()
+    st.cache_data.clear()
+    yield tmp_path
+    st.cache_resource.clear()
+    st.cache_data.clear()
+
+
+def seed_tracked_uploads(base_dir, count):
+    tracked = {}
+    now = datetime.datetime.now().isoformat()
+    for index in range(count):
+        upload_dir = os.path.join(base_dir, f"upload{index}")
+        os.makedirs(upload_dir)
+        with open(os.path.join(upload_dir, f"recording{index}.wav"), "wb") as f:
+            f.write(b"RIFF")
+        tracked[upload_dir] = now
+    with open("temp_dir_tracker.json", "w") as f:
+        json.dump(tracked, f)
+
+
+# Function to rerun each app once per slider value, taking turns so that machine load affects every app alike,
+# and return the sorted rerun durations in milliseconds per app
+def measure_reruns(*apps):
+    for at in apps:
+        at.run()
+        assert not at.exception
+        # 첫 실행에서 캐시가 채워진 뒤 같은 값으로 한 번 더 실행하여 워밍업
+        at.run()
+
+    durations = [[] for _ in apps]
+    for index in range(RERUN_COUNT):
+        for at, app_durations in zip(apps, durations):
+            at.slider[0].set_value(-20.0 - index * 0.5)
+            started = time.perf_counter()
+            at.run()
+            app_durations.append((time.perf_counter() - started) * 1000)
+            assert not at.exception
+    return [sorted(app_durations) for app_durations in durations]
+
+def p95(durations):
+    return durations[int(len(durations) * 0.95) - 1]
+
+
+def test_rerun_p95_with_many_tracked_uploads(isolated_app):
+    seed_tracked_uploads(str(isolated_app / "uploads"), TRACKED_UPLOAD_COUNT)
+
+    # AppTest는 실행마다 app.py를 다시 컴파일하고 스크립트 스레드를 새로 띄우지만 실제 서버는 컴파일 결과를 재사용함
+    # 같은 소스를 슬라이더 하나만 그리고 멈추도록 실행한 시간을 기준으로 빼서 앱 코드가 쓰는 시간만 비교
+    with open(APP_PATH, encoding="utf-8") as f:
+        baseline_source = BASELINE_PREAMBLE + f.read()
+    app_durations, baseline_durations = measure_reruns(AppTest.from_file(APP_PATH, default_timeout=60),
+                                                       AppTest.from_string(baseline_source, default_timeout=60))
+
+    app_p95 = p95(app_durations) - p95(baseline_durations)
+    assert app_p95 < RERUN_P95_BUDGET_MS, \
+        f"rerun p95 {p95(app_durations):.1f} ms - AppTest baseline {p95(baseline_durations):.1f} ms (budget {RERUN_P95_BUDGET_MS} ms)"
@@ -0,0 +1,170 @@
+import os
+import time
+
+import pytest
+
+from watch_folders import FolderWatcher, add_watch_folder, DIR_MTIME_SETTLE_SECONDS
+
+STABLE_SECONDS = 10
+FULL_RESCAN_SECONDS = 300
+
+
+@pytest.fixture
+def watched_dir(tmp_path, monkeypatch):
+    # 설정/색인 파일은 현재 폴더에 저장되므로 테스트마다 분리
+    monkeypatch.chdir(tmp_path)
+    folder = tmp_path / "rig"
+    folder.mkdir()
+    add_watch_folder(str(folder), {"export_format": "MP4 파일"})
+    return folder
+
+
+class Recorder:
+    def __init__(self):
+        self.paths = []
+
+    def __call__(self, path, profile):
+        self.paths.append(os.path.basename(path))
+        return f"job-{len(self.paths)}"
+
+
+def make_watcher(recorder):
+    return FolderWatcher(recorder, stable_seconds=STABLE_SECONDS, full_rescan_seconds=FULL_RESCAN_SECONDS,
+                         start=False)
+
+def write_file(path, data=b"\0" * 1024):
+    with open(path, "wb") as f:
+        f.write(data)
+
+def set_mtime_ns(path, mtime_ns):
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+# Function to scan until the given time has passed the stability window (two scans: first sight, then stable)
+def scan_until_stable(watcher, now):
+    watcher.scan_once(now)
+    watcher.scan_once(now + STABLE_SECONDS)
+    return now + STABLE_SECONDS
+
+
+def test_file_is_enqueued_once_after_it_is_stable(watched_dir):
+    recorder = Recorder()
+    watcher = make_watcher(recorder)
+    write_file(watched_dir / "take1.mp4")
+
+    watcher.scan_once(0)
+    assert recorder.paths == []
+    watcher.scan_once(STABLE_SECONDS)
+    watcher.scan_once(STABLE_SECONDS * 2)
+    assert recorder.paths == ["take1.mp4"]
+    assert watcher.job_ids == ["job-1"]
+
+
+def test_file_added_in_the_same_dir_mtime_tick_is_found(watched_dir):
+    recorder = Recorder()
+    watcher = make_watcher(recorder)
+    write_file(watched_dir / "take1.mp4")
+    # SMB/FAT 처럼 두 번째 파일을 추가해도 폴더 수정 시각이 그대로인 경우
+    dir_mtime_ns = os.stat(watched_dir).st_mtime_ns
+    now = scan_until_stable(watcher, 0)
+
+    write_file(watched_dir / "take2.mp4")
+    set_mtime_ns(watched_dir, dir_mtime_ns)
+    scan_until_stable(watcher, now + 1)
+    assert recorder.paths == ["take1.mp4", "take2.mp4"]
+
+
+def test_periodic_full_rescan_finds_files_behind_a_cached_dir_mtime(watched_dir):
+    recorder = Recorder()
+    watcher = make_watcher(recorder)
+    # 수정 시각이 오래 전이라 바로 다시 읽을 필요가 없는 폴더 (NFS 속성 캐시 등으로 수정 시각이 갱신되지 않음)
+    old_mtime_ns = time.time_ns() - (DIR_MTIME_SETTLE_SECONDS + 60) * 1_000_000_000
+    set_mtime_ns(watched_dir, old_mtime_ns)
+    watcher.scan_once(0)
+
+    write_file(watched_dir / "take1.mp4")
+    set_mtime_ns(watched_dir, old_mtime_ns)
+    scan_until_stable(watcher, 1)
+    assert recorder.paths == []
+
+    scan_until_stable(watcher, FULL_RESCAN_SECONDS)
+    assert recorder.paths == ["take1.mp4"]
+
+
+def test_overwritten_file_is_processed_again(watched_dir):
+    recorder = Recorder()
+    watcher = make_watcher(recorder)
+    take = watched_dir / "take1.mp4"
+    write_file(take)
+    now = scan_until_stable(watcher, 0)
+    assert recorder.paths == ["take1.mp4"]
+
+    # 같은 이름으로 다시 녹화 (폴더 수정 시각은 바뀌지 않음)
+    write_file(take, b"\1" * 2048)
+    scan_until_stable(watcher, now + 1)
+    assert recorder.paths == ["take1.mp4", "take1.mp4"]
+
+
+def test_enqueued_files_are_not_processed_again_after_restart(watched_dir):
+    recorder = Recorder()
+    write_file(watched_dir / "take1.mp4")
+    scan_until_stable(make_watcher(recorder), 0)
+
+    restarted = make_watcher(recorder)
+    scan_until_stable(restarted, 0)
+    scan_until_stable(restarted, STABLE_SECONDS * 2)
+    assert recorder.paths == ["take1.mp4"]
+
+
+def test_enqueued_files_are_not_stat_on_every_poll(watched_dir, monkeypatch):
+    recorder = Recorder()
+    watcher = make_watcher(recorder)
+    take = watched_dir / "take1.mp4"
+    write_file(take)
+    old_mtime_ns = time.time_ns() - (DIR_MTIME_SETTLE_SECONDS + 60) * 1_000_000_000
+    set_mtime_ns(watched_dir, old_mtime_ns)
+    now = scan_until_stable(watcher, 0)
+    assert recorder.paths == ["take1.mp4"]
+
+    stat_calls = []
+    real_stat = os.stat
+    def counting_stat(path, *args, **kwargs):
+        stat_calls.append(os.fspath(path))
+        return real_stat(path, *args, **kwargs)
+    monkeypatch.setattr(os, "stat", counting_stat)
+
+    # 폴더 목록을 다시 읽지 않는 동안에는 이미 처리한 파일을 확인하지 않음
+    write_file(take, b"\1" * 2048)
+    set_mtime_ns(watched_dir, old_mtime_ns)
+    scan_until_stable(watcher, now + 1)
+    assert str(take) not in stat_calls
+    assert recorder.paths == ["take1.mp4"]
+
+    # 주기적으로 목록을 다시 읽을 때 덮어쓴 파일을 찾아 다시 처리
+    scan_until_stable(watcher, FULL_RESCAN_SECONDS)
+    assert recorder.paths == ["take1.mp4", "take1.mp4"]
+
+
+def test_failing_file_does_not_block_the_rest_of_the_scan(watched_dir, tmp_path):
+    other_folder = tmp_path / "rig2"
+    other_folder.mkdir()
+    add_watch_folder(str(other_folder), {"export_format": "MP4 파일"})
+    write_file(watched_dir / "broken.mp4")
+    write_file(watched_dir / "take1.mp4")
+    write_file(other_folder / "take2.mp4")
+
+    recorder = Recorder()
+    def on_file_ready(path, profile):
+        if os.path.basename(path) == "broken.mp4":
+            raise OSError("결과 폴더에 쓸 수 없음")
+        return recorder(path, profile)
+
+    watcher = make_watcher(on_file_ready)
+    now = scan_until_stable(watcher, 0)
+    assert sorted(recorder.paths) == ["take1.mp4", "take2.mp4"]
+    assert "broken.mp4" in watcher.last_error
+
+    # 원인이 해결되면 다음 안정 대기 시간 뒤에 다시 등록하고 오류 표시를 지움
+    watcher.on_file_ready = recorder
+    watcher.scan_once(now + STABLE_SECONDS)
+    assert sorted(recorder.paths) == ["broken.mp4", "take1.mp4", "take2.mp4"]
+    assert watcher.last_error is None
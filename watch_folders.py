@@ -0,0 +1,190 @@
+import os
+import json
+import time
+import threading
+
+# 감시 폴더 설정 ([{"path": 폴더, "profile": 편집 설정}, ...])
+WATCH_FOLDER_CONFIG_FILE = "watch_folders.json"
+# 이미 작업으로 등록한 파일 목록 (재시작 후 같은 파일을 다시 처리하지 않도록 저장)
+WATCH_FOLDER_INDEX_FILE = "watch_folder_index.json"
+
+WATCH_POLL_SECONDS = 5
+# 파일 크기와 수정 시각이 이 시간(초) 동안 변하지 않으면 쓰기가 끝난 것으로 판단
+FILE_STABLE_SECONDS = 10
+# 네트워크 폴더(SMB/FAT)는 수정 시각 단위가 1~2초라 같은 시각에 추가된 파일을 놓칠 수 있으므로,
+# 목록을 읽은 시각과 폴더 수정 시각의 차이가 이 시간(초) 이내면 다음 검사에서 목록을 다시 읽음
+DIR_MTIME_SETTLE_SECONDS = 5
+# NFS처럼 폴더 속성을 캐시하는 경우를 대비해 수정 시각이 그대로여도 이 주기(초)마다 목록을 다시 읽음
+FULL_RESCAN_SECONDS = 300
+# 화면 표시용으로 기억하는 감시 폴더 작업 수 (오래된 작업부터 제외)
+MAX_TRACKED_JOB_IDS = 100
+
+MEDIA_EXTENSIONS = (".mp4", ".mov", ".avi", ".mkv", ".webm", ".wav", ".mp3")
+
+
+# Function to load the list of watched folders
+def load_watch_folders():
+    try:
+        if os.path.exists(WATCH_FOLDER_CONFIG_FILE):
+            with open(WATCH_FOLDER_CONFIG_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return []
+    except Exception:
+        return []
+
+# Function to save the list of watched folders
+def save_watch_folders(watch_folders):
+    try:
+        with open(WATCH_FOLDER_CONFIG_FILE, 'w', encoding='utf-8') as f:
+            json.dump(watch_folders, f, ensure_ascii=False, indent=2)
+    except Exception:
+        pass
+
+def add_watch_folder(folder, profile):
+    watch_folders = [entry for entry in load_watch_folders() if entry["path"] != folder]
+    watch_folders.append({"path": folder, "profile": profile})
+    save_watch_folders(watch_folders)
+
+def remove_watch_folder(folder):
+    save_watch_folders([entry for entry in load_watch_folders() if entry["path"] != folder])
+
+
+class WatchedFile:
+    def __init__(self, size, mtime_ns, now):
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.stable_since = now
+        self.enqueued = False
+
+
+class FolderWatcher:
+    def __init__(self, on_file_ready, poll_seconds=WATCH_POLL_SECONDS, stable_seconds=FILE_STABLE_SECONDS,
+                 full_rescan_seconds=FULL_RESCAN_SECONDS, start=True):
+        self.on_file_ready = on_file_ready  # (파일 경로, 편집 설정) → 작업 ID
+        self.poll_seconds = poll_seconds
+        self.stable_seconds = stable_seconds
+        self.full_rescan_seconds = full_rescan_seconds
+        # 폴더별 stat 캐시: {폴더: {"dir_mtime_ns": ..., "listed_at_ns": ..., "listed_at": ..., "files": {파일 경로: WatchedFile}}}
+        self.index = {}
+        self.job_ids = []
+        self.last_error = None
+        self.lock = threading.Lock()
+        self.enqueued_files = self._load_enqueued_files()
+        if start:
+            threading.Thread(target=self._run, daemon=True).start()
+
+    def _load_enqueued_files(self):
+        try:
+            if os.path.exists(WATCH_FOLDER_INDEX_FILE):
+                with open(WATCH_FOLDER_INDEX_FILE, 'r', encoding='utf-8') as f:
+                    return {path: tuple(identity) for path, identity in json.load(f).items()}
+        except Exception:
+            pass
+        return {}
+
+    def _save_enqueued_files(self):
+        try:
+            with open(WATCH_FOLDER_INDEX_FILE, 'w', encoding='utf-8') as f:
+                json.dump(self.enqueued_files, f, ensure_ascii=False)
+        except Exception:
+            pass
+
+    def _run(self):
+        while True:
+            try:
+                self.scan_once()
+            except Exception as e:
+                self.last_error = str(e)
+            time.sleep(self.poll_seconds)
+
+    def scan_once(self, now=None):
+        now = time.monotonic() if now is None else now
+        watch_folders = load_watch_folders()
+        watched_paths = {entry["path"] for entry in watch_folders}
+        # 감시 목록에서 빠진 폴더의 캐시 삭제
+        for folder in list(self.index):
+            if folder not in watched_paths:
+                del self.index[folder]
+
+        # 한 폴더/파일에서 오류가 나도 나머지는 계속 확인하고, 이번 검사의 오류만 화면에 표시
+        errors = []
+        for entry in watch_folders:
+            try:
+                self._scan_folder(entry["path"], entry["profile"], now, errors)
+            except Exception as e:
+                errors.append(f"{entry['path']}: {e}")
+        self.last_error = "\n".join(errors) or None
+
+    def _scan_folder(self, folder, profile, now, errors):
+        try:
+            dir_mtime_ns = os.stat(folder).st_mtime_ns
+        except OSError:
+            return
+        state = self.index.setdefault(folder, {"dir_mtime_ns": None, "listed_at_ns": None, "listed_at": None, "files": {}})
+        files = state["files"]
+
+        # 폴더에 파일이 추가/삭제/이름 변경된 경우에만 목록을 다시 읽음
+        # (단, 수정 시각이 목록을 읽은 시각과 너무 가깝거나 마지막으로 읽은 지 오래되었으면 다시 읽음)
+        needs_listing = (
+            dir_mtime_ns != state["dir_mtime_ns"]
+            or state["listed_at_ns"] - dir_mtime_ns < DIR_MTIME_SETTLE_SECONDS * 1_000_000_000
+            or now - state["listed_at"] >= self.full_rescan_seconds
+        )
+        if needs_listing:
+            state["dir_mtime_ns"] = dir_mtime_ns
+            state["listed_at_ns"] = time.time_ns()
+            state["listed_at"] = now
+            present = set()
+            with os.scandir(folder) as entries:
+                for dir_entry in entries:
+                    if not dir_entry.name.lower().endswith(MEDIA_EXTENSIONS) or not dir_entry.is_file():
+                        continue
+                    present.add(dir_entry.path)
+                    watched = files.get(dir_entry.path)
+                    if watched is None:
+                        entry_stat = dir_entry.stat()
+                        files[dir_entry.path] = WatchedFile(entry_stat.st_size, entry_stat.st_mtime_ns, now)
+                        identity = (entry_stat.st_size, entry_stat.st_mtime_ns)
+                        if self.enqueued_files.get(dir_entry.path) == identity:
+                            files[dir_entry.path].enqueued = True
+                    elif watched.enqueued:
+                        # 이미 처리한 파일은 목록을 다시 읽을 때만 확인 (같은 이름으로 덮어쓰거나 다시 녹화한 파일은 새 파일로 보고 다시 처리)
+                        entry_stat = dir_entry.stat()
+                        identity = (entry_stat.st_size, entry_stat.st_mtime_ns)
+                        if identity != self.enqueued_files.get(dir_entry.path):
+                            watched.enqueued = False
+                            watched.size, watched.mtime_ns = identity
+                            watched.stable_since = now
+            for path in list(files):
+                if path not in present:
+                    del files[path]
+
+        # 아직 처리하지 않은 파일만 매번 stat 하여 쓰기가 끝났는지 확인 (네트워크 폴더에 지난 녹화 파일이 많아도 부담 없도록)
+        for path, watched in files.items():
+            if watched.enqueued:
+                continue
+            try:
+                file_stat = os.stat(path)
+            except OSError:
+                continue
+            identity = (file_stat.st_size, file_stat.st_mtime_ns)
+            if identity != (watched.size, watched.mtime_ns):
+                watched.size = file_stat.st_size
+                watched.mtime_ns = file_stat.st_mtime_ns
+                watched.stable_since = now
+                continue
+            if watched.size > 0 and now - watched.stable_since >= self.stable_seconds:
+                # 파일을 복사하지 않고 원래 위치의 파일로 작업 등록
+                try:
+                    job_id = self.on_file_ready(path, profile)
+                except Exception as e:
+                    # 등록에 실패한 파일은 다음 안정 대기 시간이 지난 뒤 다시 시도
+                    watched.stable_since = now
+                    errors.append(f"{path}: {e}")
+                    continue
+                watched.enqueued = True
+                with self.lock:
+                    self.job_ids.append(job_id)
+                    del self.job_ids[:-MAX_TRACKED_JOB_IDS]
+                self.enqueued_files[path] = (watched.size, watched.mtime_ns)
+                self._save_enqueued_files()